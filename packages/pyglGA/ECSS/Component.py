@@ -26,9 +26,18 @@ from typing             import List
 from collections.abc    import Iterable, Iterator
 
 import pyglGA.ECSS.System
+import logging
+import sys
 import uuid  
+import weakref
 import pyglGA.ECSS.utilities as util
 
+log = logging.getLogger(__name__)
+
+def _noParent():
+    """ Stands for the weak reference of a Component removed from its parent """
+    return None
+
 
 class Component(ABC, Iterable):
     """
@@ -37,27 +46,36 @@ class Component(ABC, Iterable):
     Based on the Composite pattern, it is a data collection of specific
     class of data. 
     Concrete Subclass Components typically are e.g. BasicTransform, RenderMesh, Shader, RigidBody etc.
+    
+    Components declare their attributes in __slots__ instead of a per-instance __dict__, 
+    concrete subclasses extend them with their own attributes.
+    Leaf Components share the class level _children = None, only subclasses that have
+    children (e.g. Entity) declare a _children slot and set it.
     """
     
+    __slots__ = ('_name', '_type', '_id', '_parent', '_worldManager', '_eventManager', '__weakref__')
+    
+    _children = None
+    
     def __init__(self, name=None, type=None, id=None):
         
+        # names and types are interned, so that they hash once and compare by identity
         if (name is None):
             self._name = self.getClassName()
         else:
-            self._name = name
+            self._name = sys.intern(name) if isinstance(name, str) else name
         
         if (type is None):
             self._type = self.getClassName()
         else:
-            self._type = type
+            self._type = sys.intern(type) if isinstance(type, str) else type
         
         if id is None:
             self._id = uuid.uuid1().int #assign unique ID on Component
         else:
             self._id = id
         
-        self._parent = self
-        self._children = None
+        self._parent = None # weak reference to the parent, None while the parent is this Component
         self._worldManager = None
         self._eventManager = None
     
@@ -68,7 +86,7 @@ class Component(ABC, Iterable):
         return self._name
     @name.setter
     def name(self, value):
-        self._name = value
+        self._name = sys.intern(value) if isinstance(value, str) else value
         
     @property #type
     def type(self) -> str:
@@ -76,7 +94,7 @@ class Component(ABC, Iterable):
         return self._type
     @type.setter
     def type(self, value):
-        self._type = value
+        self._type = sys.intern(value) if isinstance(value, str) else value
         
     @property #id
     def id(self) -> int:
@@ -88,11 +106,18 @@ class Component(ABC, Iterable):
         
     @property #parent
     def parent(self) -> Component:
-        """ Get Component's parent """
-        return self._parent
+        """ Get Component's parent, the Component itself until it is added, None after it is removed """
+        parent = self._parent
+        return self if parent is None else parent()
     @parent.setter
     def parent(self, value):
-        self._parent = value
+        # the parent is held by a weak reference, so that parent-child links do not form reference cycles
+        if value is self:
+            self._parent = None
+        elif value is None:
+            self._parent = _noParent
+        else:
+            self._parent = weakref.ref(value)
         
     @property #ECSSManager
     def worldManager(self):
@@ -120,7 +145,8 @@ class Component(ABC, Iterable):
         return None
     
     def getNumberOfChildren(self) -> int:
-        return len(self._children)
+        """ Get the number of children, 0 for leaf Components that have no children list """
+        return 0 if self._children is None else len(self._children)
     
     @classmethod
     def getClassName(cls):
@@ -156,7 +182,7 @@ class Component(ABC, Iterable):
         """
         prints out name, type, id, parent of this Component
         """
-        print(f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self._parent._name}")
+        print(f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self.parent.name}")
         print(f" ______________________________________________________________")
     
     def __iter__(self):
@@ -166,7 +192,7 @@ class Component(ABC, Iterable):
         return self 
     
     def __str__(self):
-        return f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self._parent._name}"
+        return f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self.parent.name}"
 
 
 class ComponentDecorator(Component):
@@ -178,6 +204,8 @@ class ComponentDecorator(Component):
     :rtype: [type]
     """
     
+    __slots__ = ('_component',)
+    
     def __init__(self, comp, name=None, type=None, id=None):
         super().__init__(name, type, id)
         self._component = comp
@@ -220,7 +248,11 @@ class CompNullIterator(Iterator, ComponentIterator):
         self._comp = comp
     
     def __next__(self):
-        return None
+        raise StopIteration
+
+
+# a null iterator has no state, so all Components without children share this one
+_NULL_ITER = CompNullIterator(None)
     
 
 class BasicTransform(Component):
@@ -233,6 +265,8 @@ class BasicTransform(Component):
     :param Component: [description]
     :type Component: [type]
     """
+    
+    __slots__ = ('_trs', '_l2world', '_l2cam', '_row')
    
     def __init__(self, name=None, type=None, id=None, trs=None):
         
@@ -245,32 +279,76 @@ class BasicTransform(Component):
             
         self._l2world = util.identity()
         self._l2cam = util.identity()
-        self._parent = self
-        self._children = []
+        # row in the ECSSManager TransformSoA buffers, None while this Component
+        # is not bound to an ECSSManager and keeps its own matrices
+        self._row = None
+    
+    @property #row
+    def row(self):
+        """ Get Component's row in the ECSSManager TransformSoA buffers """
+        return self._row
          
     @property #trs
     def trs(self):
         """ Get Component's transform: translation, rotation ,scale """
-        return self._trs
+        if self._row is None:
+            return self._trs
+        return self._worldManager.transformSoA.trs_buf[self._row]
     @trs.setter
     def trs(self, value):
-        self._trs = value
+        if self._row is None:
+            self._trs = value
+        else:
+            self._worldManager.transformSoA.trs_buf[self._row] = value
 
     @property #l2world
     def l2world(self):
         """ Get Component's local to world transform: translation, rotation ,scale """
-        return self._l2world
+        if self._row is None:
+            return self._l2world
+        return self._worldManager.transformSoA.l2w_buf[self._row]
     @l2world.setter
     def l2world(self, value):
-        self._l2world = value
+        if self._row is None:
+            self._l2world = value
+        else:
+            self._worldManager.transformSoA.l2w_buf[self._row] = value
         
     @property #l2cam
     def l2cam(self):
         """ Get Component's local to camera transform: translation, rotation ,scale, projection """
-        return self._l2cam
+        if self._row is None:
+            return self._l2cam
+        return self._worldManager.transformSoA.l2c_buf[self._row]
     @l2cam.setter
     def l2cam(self, value):
-        self._l2cam = value                 
+        if self._row is None:
+            self._l2cam = value
+        else:
+            self._worldManager.transformSoA.l2c_buf[self._row] = value
+    
+    def bind(self, worldManager, row: int):
+        """
+        Moves this Component's matrices in a row of the ECSSManager TransformSoA buffers,
+        out of the row it was bound to before, if any
+        """
+        self.unbind()
+        worldManager.transformSoA.setRow(row, self._trs, self._l2world, self._l2cam)
+        self._worldManager = worldManager
+        self._row = row
+        self._trs = self._l2world = self._l2cam = None
+    
+    def unbind(self):
+        """
+        Copies this Component's matrices out of the ECSSManager TransformSoA buffers, 
+        so that their row can be reused by another BasicTransform
+        """
+        if self._row is not None:
+            self._trs = self.trs.copy()
+            self._l2world = self.l2world.copy()
+            self._l2cam = self.l2cam.copy()
+            self._row = None
+            self._worldManager = None
     
     def update(self, **kwargs):
         """ Local 2 world transformation calculation
@@ -278,19 +356,23 @@ class BasicTransform(Component):
         
         Arguments could be "l2world=" or "trs=" or "l2cam=" to set respective matrices 
         """
-        print(self.getClassName(), ": update() called")
+        if __debug__:
+            log.debug("%s: update() called", self.getClassName())
         arg1 = "l2world"
         arg2 = "trs"
         arg3 = "l2cam"
         if arg1 in kwargs:
-            print("Setting: ", arg1," with: \n", kwargs[arg1])
-            self._l2world = kwargs[arg1]
+            if __debug__:
+                log.debug("Setting: %s with: \n%s", arg1, kwargs[arg1])
+            self.l2world = kwargs[arg1]
         if arg2 in kwargs:
-            print("Setting: ", arg2," with: \n", kwargs[arg2])
-            self._trs = kwargs[arg2]
+            if __debug__:
+                log.debug("Setting: %s with: \n%s", arg2, kwargs[arg2])
+            self.trs = kwargs[arg2]
         if arg3 in kwargs:
-            print("Setting: ", arg3," with: \n", kwargs[arg3])
-            self._l2cam = kwargs[arg3]
+            if __debug__:
+                log.debug("Setting: %s with: \n%s", arg3, kwargs[arg3])
+            self.l2cam = kwargs[arg3]
         
        
     def accept(self, system: pyglGA.ECSS.System, event = None):
@@ -318,12 +400,12 @@ class BasicTransform(Component):
         pass
     
     def __str__(self):
-        return f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self._parent._name}, \nl2world: \n{self.l2world}, \nl2cam: \n{self.l2cam}, \ntrs: \n{self.trs}"
+        return f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self.parent.name}, \nl2world: \n{self.l2world}, \nl2cam: \n{self.l2cam}, \ntrs: \n{self.trs}"
     
     def __iter__(self) ->CompNullIterator:
         """ A concrete component does not have children to iterate, thus a NULL iterator
         """
-        return CompNullIterator(self) 
+        return _NULL_ITER
 
 
 class Camera(Component):
@@ -335,6 +417,8 @@ class Camera(Component):
     :param Component: [description]
     :type Component: [type]
     """
+    
+    __slots__ = ('_projMat', '_root2cam', '_row')
    
     def __init__(self, projMatrix=None, name=None, type=None, id=None, left=-100.0, right=100.0, bottom=-100.0, top=100.0, near=1.0, far=100.0):
         super().__init__(name, type, id)
@@ -344,34 +428,75 @@ class Camera(Component):
         else:
             self._projMat = util.ortho(left, right, bottom, top, near, far)
         self._root2cam = util.identity()
-        self._parent = self
+        # row in the ECSSManager CameraSoA buffers, None while this Component
+        # is not bound to an ECSSManager and keeps its own matrices
+        self._row = None
+    
+    @property #row
+    def row(self):
+        """ Get Component's row in the ECSSManager CameraSoA buffers """
+        return self._row
          
     @property #projMat
     def projMat(self):
         """ Get Component's camera Projection matrix """
-        return self._projMat
+        if self._row is None:
+            return self._projMat
+        return self._worldManager.cameraSoA.proj_buf[self._row]
     @projMat.setter
     def projMat(self, value):
-        self._projMat = value
+        if self._row is None:
+            self._projMat = value
+        else:
+            self._worldManager.cameraSoA.proj_buf[self._row] = value
     
     @property #_root2cam
     def root2cam(self):
         """ Get Component's root to camera matrix """
-        return self._root2cam
+        if self._row is None:
+            return self._root2cam
+        return self._worldManager.cameraSoA.vp_buf[self._row]
     @root2cam.setter
-    def orthoroot2camMat(self, value):
-        self._root2cam = value                   
+    def root2cam(self, value):
+        if self._row is None:
+            self._root2cam = value
+        else:
+            self._worldManager.cameraSoA.vp_buf[self._row] = value
+    
+    def bind(self, worldManager, row: int):
+        """
+        Moves this Component's matrices in a row of the ECSSManager CameraSoA buffers,
+        out of the row it was bound to before, if any
+        """
+        self.unbind()
+        worldManager.cameraSoA.setRow(row, proj=self._projMat, vp=self._root2cam)
+        self._worldManager = worldManager
+        self._row = row
+        self._projMat = self._root2cam = None
+    
+    def unbind(self):
+        """
+        Copies this Component's matrices out of the ECSSManager CameraSoA buffers, 
+        so that their row can be reused by another Camera
+        """
+        if self._row is not None:
+            self._projMat = self.projMat.copy()
+            self._root2cam = self.root2cam.copy()
+            self._row = None
+            self._worldManager = None
     
     def update(self, **kwargs):
         """ Update Camera matrices
         
         Arguments could be "root2cam=" to set respective matrices 
         """
-        print(self.getClassName(), ": update() called")
+        if __debug__:
+            log.debug("%s: update() called", self.getClassName())
         arg1 = "root2cam"
         if arg1 in kwargs:
-            print("Setting: ", arg1," with: \n", kwargs[arg1])
-            self._root2cam = kwargs[arg1]
+            if __debug__:
+                log.debug("Setting: %s with: \n%s", arg1, kwargs[arg1])
+            self.root2cam = kwargs[arg1]
        
        
     def accept(self, system: pyglGA.ECSS.System, event = None):
@@ -397,13 +522,13 @@ class Camera(Component):
     
     
     def __str__(self):
-        return f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self._parent._name}, \n projMat: \n{self.projMat},\n root2cam: \n{self.root2cam}"
+        return f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self.parent.name}, \n projMat: \n{self.projMat},\n root2cam: \n{self.root2cam}"
     
     
     def __iter__(self) ->CompNullIterator:
         """ A component does not have children to iterate, thus a NULL iterator
         """
-        return CompNullIterator(self) 
+        return _NULL_ITER
 
 class RenderMesh(Component):
     """
@@ -411,7 +536,9 @@ class RenderMesh(Component):
 
     Accepts a dedicated RenderSystem to initiate rendering of the RenderMesh, using its vertex attributes (property)
     """
-    def __init__(self, name=None, type=None, id=None, vertex_attributes=None, vertex_index=None):
+    
+    __slots__ = ('_vertex_attributes', '_vertex_index', '_vao_id', '_material_id')
+    def __init__(self, name=None, type=None, id=None, vertex_attributes=None, vertex_index=None, vao_id=0, material_id=0):
         """ Initialize the generic RenderMesh component with the vertex attribute arrays
         this is the generic place to store all vertex attributes (vertices, colors, normals, bone weights etc.)
         specifically for OpenGL buffers, these will be passed to a VertexArray by a RenderGLShaderSystem
@@ -421,7 +548,6 @@ class RenderMesh(Component):
         """
         super().__init__(name, type, id)
         
-        self._parent = self
         if not vertex_attributes:
             self._vertex_attributes = [] #list of vertex attribute lists 
         else:
@@ -431,6 +557,9 @@ class RenderMesh(Component):
                 self.vertex_index = [] #list of vertex attribute lists 
         else:
             self._vertex_index = vertex_index
+        # vertex array and material ids of the draw commands, assigned by a rendering backend
+        self._vao_id = vao_id
+        self._material_id = material_id
     
     @property
     def vertex_attributes(self):
@@ -447,9 +576,48 @@ class RenderMesh(Component):
     @vertex_index.setter
     def vertex_index(self, value):
         self._vertex_index = value
+    
+    @property
+    def vao_id(self):
+        return self._vao_id
+    
+    @vao_id.setter
+    def vao_id(self, value):
+        self._vao_id = value
+    
+    @property
+    def material_id(self):
+        return self._material_id
+    
+    @material_id.setter
+    def material_id(self, value):
+        self._material_id = value
+    
+    @property
+    def index_count(self) -> int:
+        """ Get the number of indices to draw, the number of vertices for non indexed meshes """
+        if len(self._vertex_index):
+            return len(self._vertex_index)
+        if len(self._vertex_attributes):
+            return len(self._vertex_attributes[0])
+        return 0
         
     def update(self):
-        print(self.getClassName(), ": update() called")
+        if __debug__:
+            log.debug("%s: update() called", self.getClassName())
+    
+    def emit(self, cmdbuf, instance_id: int = -1) -> int:
+        """
+        Appends the draw command of this RenderMesh in a CommandBuffer, instead of drawing it
+        
+        :param cmdbuf: the command buffer of the frame, usually ECSSManager.commandBuffer
+        :type cmdbuf: Storage.CommandBuffer
+        :param instance_id: TransformSoA row of the Entity's BasicTransform, -1 if it has none
+        :type instance_id: int
+        :return: the index of the command
+        :rtype: int
+        """
+        return cmdbuf.append(self._vao_id, self.index_count, instance_id, self._material_id)
    
    
     def accept(self, system: pyglGA.ECSS.System, event = None):
@@ -472,18 +640,18 @@ class RenderMesh(Component):
         """
         prints out name, type, id, parent of this Component
         """
-        print(f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self._parent._name}, vertex_attributes: \n{self._vertex_attributes}")
+        print(f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self.parent.name}, vertex_attributes: \n{self._vertex_attributes}")
         print(f" ______________________________________________________________")
     
     
     def __str__(self):
-        return f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self._parent._name}, vertex_attributes: \n{self._vertex_attributes}"
+        return f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self.parent.name}, vertex_attributes: \n{self._vertex_attributes}"
 
     
     def __iter__(self) ->CompNullIterator:
         """ A component does not have children to iterate, thus a NULL iterator
         """
-        return CompNullIterator(self) 
+        return _NULL_ITER
     
     
 class BasicTransformDecorator(ComponentDecorator):
@@ -493,6 +661,8 @@ class BasicTransformDecorator(ComponentDecorator):
     :param ComponentDecorator: [description]
     :type ComponentDecorator: [type]
     """
+    
+    __slots__ = ()
     def init(self):
         """
         example of a decorator
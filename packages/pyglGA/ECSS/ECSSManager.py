@@ -9,15 +9,26 @@ glGA SDK v2021.0.5 ECSS (Entity Component System in a Scenegraph)
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from collections.abc import Iterable, Iterator
-from typing import List, Dict
+from typing import List, Dict, Tuple, FrozenSet, Callable
+import array
+import gc
+import io
+import logging
+import operator
 import pprint
+import sys
 import time
 
+import numpy as np
+
 from pyglGA.ECSS.Entity import Entity
 import pyglGA.ECSS.Component
 import pyglGA.ECSS.System
 import pyglGA.ECSS.utilities as util
 import pyglGA.ECSS.Event 
+from pyglGA.ECSS.Storage import Archetype, TransformSoA, CameraSoA, CommandBuffer
+
+log = logging.getLogger(__name__)
 
 class ECSSManager():
     """
@@ -42,16 +53,79 @@ class ECSSManager():
 
     def __init__(self):
         """
-        Construct initial data structures for scenegraph elements
+        Construct initial data structures for scenegraph elements.
+
+        Every ECSSManager() call returns the same singleton instance, so the data structures 
+        are only built by the first call and kept afterwards.
+        """
+        if getattr(self, '_initialized', False):
+            return
+        # (Component type, System type) to the System method that processes that Component,
+        # built once and kept for the lifetime of the singleton
+        self._dispatch: Dict[Tuple[type, type], Callable] = self._buildDispatch()
+        # Component type to the (add, remove) ECSSManager methods that keep it in its list,
+        # types without an entry are kept in the generic _components
+        self._pool_for_type: Dict[type, Tuple[Callable, Callable]] = self._buildPools()
+        # Component type to its pool resolved via its MRO, cleared when a pool is registered
+        self._pool_cache: Dict[type, Tuple[Callable, Callable]] = {}
+        # incremented whenever the set of archetypes changes, including by reset(), 
+        # so that Systems bound at an older generation bind their columns again
+        self._archetype_generation = 0
+        self.reset()
+        self._initialized = True
+
+    def reset(self):
+        """
+        Clears all scenegraph elements (Entities, Components, Systems), e.g. to build a new scene.
+        Registered dispatch entries are kept.
+
+        Entities and Components of the previous scene are detached from the ECSSManager:
+        they lose their dense ids and keep their matrices outside of the cleared buffers.
         """
+        if getattr(self, '_initialized', False):
+            for entity in self._entity_pool:
+                entity.row = None
+                entity.worldManager = None
+            for component in self._components:
+                if isinstance(component, pyglGA.ECSS.Component.BasicTransform):
+                    component.unbind()
+            for camera in self._cameras:
+                camera.unbind()
         self._systems: List[pyglGA.ECSS.System.System] = []  # list for all systems
-        # list with all scenegraph components
-        self._components: List[pyglGA.ECSS.Component.Component] = []
-        self._entities: List[Entity] = []  # list of all scenegraph entities
+        self._archetype_generation += 1
+        # all scenegraph components, as an insertion ordered dict for O(1) removal
+        self._components: Dict[pyglGA.ECSS.Component.Component, None] = {}
+        # dense ids of all scenegraph entities, an entity's id is its row in the _entity_pool
+        self._entity_ids = array.array('i')
+        self._entity_pool: List[Entity] = []  # list of all scenegraph entities
+        # number of children (Entities and Components) of each entity, indexed by its dense id
+        self._child_count = np.zeros(64, dtype=np.int32)
         # list of all scenegraph camera components
         self._cameras: List[pyglGA.ECSS.Component.Component] = []
-        # dict with keys entities and values list of components per entity
-        self._entities_components = {}
+        # dense ids of the entities owning each camera component
+        self._camera_ids = np.empty(8, dtype=np.int32)
+        # contiguous matrix buffers of all camera components, in the same order as _cameras
+        self._camera_soa = CameraSoA()
+        # True when l2world matrices or cameras changed since the last updateCameras()
+        self._cameras_stale = True
+        # archetype tables, keyed by the set of component types of their entities
+        self._archetypes: Dict[FrozenSet[type], Archetype] = {frozenset(): Archetype()}
+        # entity id to (archetype, row) where its components are stored
+        self._entity_index: Dict[int, Tuple[Archetype, int]] = {}
+        # contiguous matrix buffers of all BasicTransform components
+        self._transform_soa = TransformSoA()
+        # draw commands of the RenderMesh components, submitted by a RenderSystem flush()
+        self._command_buffer = CommandBuffer()
+        # flattened scenegraph, rebuilt on demand after the hierarchy changes:
+        # entity ids in depth-first pre-order and the position of each one's parent (-1 for roots)
+        self._dfs_order: np.ndarray = None
+        self._parent_row: np.ndarray = None
+        # TransformSoA rows in the same pre-order and the row of each one's parent BasicTransform
+        self._transform_order: np.ndarray = None
+        self._transform_parent: np.ndarray = None
+        # True if the root's subtree is the whole scenegraph and all its Entities and Components 
+        # were added via the ECSSManager, so that Systems can sweep the dense storage instead
+        self._fully_managed = False
         # the ECSSManager creates one main EventManager for the whole world
         self._eventManager = pyglGA.ECSS.Event.EventManager()
         self._root = None
@@ -77,19 +151,91 @@ class ECSSManager():
     
     @property # Components getter
     def components(self) -> List:
-        return self._components
+        return list(self._components)
     
     @property # Entities getter
     def entities(self) -> List:
-        return self._entities
+        return self._entity_pool
+    
+    @property # Entity ids getter
+    def entity_ids(self) -> array.array:
+        return self._entity_ids
     
     @property # Camera Components getter
     def cameras(self) -> List:
         return self._cameras
     
+    @property # Camera entity ids getter
+    def camera_ids(self) -> np.ndarray:
+        return self._camera_ids[:len(self._cameras)]
+    
+    @property # child count getter
+    def child_count(self) -> np.ndarray:
+        return self._child_count[:len(self._entity_pool)]
+    
+    @property # Archetypes getter
+    def archetypes(self) -> Dict:
+        return self._archetypes
+    
+    @property # archetype generation getter
+    def archetype_generation(self) -> int:
+        return self._archetype_generation
+    
+    @property # CameraSoA getter
+    def cameraSoA(self) -> CameraSoA:
+        return self._camera_soa
+    
+    @property # CommandBuffer getter
+    def commandBuffer(self) -> CommandBuffer:
+        return self._command_buffer
+    
+    @property # TransformSoA getter
+    def transformSoA(self) -> TransformSoA:
+        return self._transform_soa
+    
+    @property # flattened scenegraph getter
+    def dfs_order(self) -> np.ndarray:
+        """ Get the entity ids in depth-first pre-order """
+        if self._dfs_order is None:
+            self.rebuildTraversal()
+        return self._dfs_order
+    
+    @property # flattened scenegraph parents getter
+    def parent_row(self) -> np.ndarray:
+        """ Get the position in dfs_order of each entity's parent, -1 for root entities """
+        if self._dfs_order is None:
+            self.rebuildTraversal()
+        return self._parent_row
+    
+    @property # fully managed getter
+    def fully_managed(self) -> bool:
+        """ Get whether the root's subtree is the whole scenegraph, built via the ECSSManager """
+        if self._dfs_order is None:
+            self.rebuildTraversal()
+        return self._fully_managed
+    
+    @property # flattened TransformSoA getter
+    def transform_order(self) -> np.ndarray:
+        """ Get the TransformSoA rows in depth-first pre-order """
+        if self._dfs_order is None:
+            self.rebuildTraversal()
+        return self._transform_order
+    
+    @property # flattened TransformSoA parents getter
+    def transform_parent(self) -> np.ndarray:
+        """ Get the TransformSoA row of the parent BasicTransform of each transform_order row, -1 if none """
+        if self._dfs_order is None:
+            self.rebuildTraversal()
+        return self._transform_parent
+    
     @property # Components per Entity getter
     def entities_components(self) -> Dict:
-        return self._entities_components
+        """ Get a dict with keys entities and values list of components per entity """
+        entities_components = {}
+        for entity_id in self._entity_ids:
+            archetype, row = self._entity_index[entity_id]
+            entities_components[self._entity_pool[entity_id]] = list(archetype.getRow(row).values())
+        return entities_components
     
 
     def createEntity(self, entity: Entity):
@@ -102,9 +248,7 @@ class ECSSManager():
         :type entity: Entity
         """
         if isinstance(entity, Entity):
-            # add an empty list for components with the new Entity
-            self._entities.append(entity)
-            self._entities_components[entity] = [None]
+            self._registerEntity(entity)
 
             # @@@GPTODO: refactor so that only first entity is set to root
             # now it is hardcoded with the name root 
@@ -145,7 +289,8 @@ class ECSSManager():
         """
         Adds a component to an Entity in a scenegraph and in the ECSS data structures
 
-        Checks if that Component is a Camera, to add it in the list of Cameras
+        Adds the component in the list of its type registered with registerPool(),
+        e.g. Cameras in the list of Cameras, or else in the generic list of components
 
         Checks if that Entity has already such a component of that type and replaces 
         it with the new one
@@ -159,52 +304,279 @@ class ECSSManager():
         :type component: Component
         """
         if isinstance(entity, Entity) and isinstance(component, pyglGA.ECSS.Component.Component):
-            if isinstance(component, pyglGA.ECSS.Component.Camera):
-                self._cameras.append(component)
-            else:  # add the component in the _components []
-                self._components.append(component)
-
-            # loop through all dictionary elements of _entities_components
-            for key, value in self._entities_components.items():
-                if key is entity:  # find key [entity]
-                    # el are Components (but can also be Entities)
-                    for index, el in enumerate(value):
-                        # check if the value list() of that entity has already that component type
-                        # we only add Components here and not Entities
-                        if isinstance(el, type(component)) and not isinstance(el, Entity):
-                            # if it has it, replace previous component with same type
-                            # bur first remove previous from scenegraph and add new one
-                            # remove it from scenegraph Entity's children list
-                            key.remove(el)
-                            # remove previous component from _entities_components list
-                            value.remove(el)
-                            # remove component from ECSSManager _components list
-                            self._components.remove(el)
-                            # insert new component at same index
-                            value.insert(index, component)
-                            # add it in the scenegraph as child of the Entity
-                            key.add(component)
-                        else:  # otherwise add it in ECSSManager and in Scenegraph
-                            key.add(component)
-                            # check if there is a list of components and add it there otherwise create one
-                            if isinstance(value, list):
-                                # check if first element is None
-                                if (value[0] == None):
-                                    value[0] = component
-                                elif component not in value:
-                                    value.append(component)
-                            else:
-                                value = list(component)
-                            return component
+            if entity.row is None:
+                self._registerEntity(entity)
+            compType = type(component)
+            previous = self.getComponent(entity, compType)
+            if previous is component:
+                # already added to this Entity
+                return component
+            # resolve the pool before changing the scenegraph
+            addToPool, removeFromPool = self.getPool(compType)
+            owner = component.parent
+            if isinstance(owner, Entity):
+                # added before to another Entity, or directly in the scenegraph
+                self._detachComponent(owner, component)
+            if previous is not None:
+                # the entity has already that component type, it is replaced in place
+                # but first remove previous from scenegraph and from the ECSSManager lists
+                entity.remove(previous)
+                removeFromPool(self, previous)
+            addToPool(self, entity, component)
+
+            archetype, row = self._entity_index[entity.row]
+
+            if previous is not None:
+                archetype.columns[compType][row] = component
+                if compType is pyglGA.ECSS.Component.BasicTransform:
+                    # reuse the TransformSoA row of the previous BasicTransform
+                    row = previous.row
+                    previous.unbind()
+                    component.bind(self, row)
+            else:
+                if compType is pyglGA.ECSS.Component.BasicTransform:
+                    component.bind(self, self._transform_soa.addRow())
+                    self.invalidateTraversal()
+                # move the entity's row to the archetype that also has the new component type
+                components = self._removeFromArchetype(entity.row)
+                components[compType] = component
+                self._addToArchetype(entity.row, components)
+            # add it in the scenegraph as child of the Entity
+            entity.add(component)
             return component
 
+    def getComponent(self, entity: Entity, compType: type):
+        """
+        Returns the component of an exact type of an Entity, None if it has no such component
+
+        :param entity: the Entity created in this ECSSManager
+        :type entity: Entity
+        :param compType: the Component class, e.g. BasicTransform
+        :type compType: type
+        """
+        archetype, row = self._entity_index.get(entity.row, (None, None))
+        if archetype is None:
+            return None
+        column = archetype.columns.get(compType)
+        if column is None:
+            return None
+        return column[row]
+
+    def invalidateTraversal(self):
+        """
+        Marks the flattened scenegraph arrays as stale, so that they are rebuilt the next time 
+        they are read. Called whenever the hierarchy changes, including by Entity.add() and Entity.remove()
+        """
+        self._dfs_order = None
+
+    def rebuildTraversal(self):
+        """
+        Flattens the scenegraph hierarchy in depth-first pre-order arrays, walking it once 
+        from the root and from every other entity without a parent.
+
+        Parents always come before their children, so a single forward sweep over the 
+        arrays visits the hierarchy top-down, without recursion.
+        """
+        BasicTransform = pyglGA.ECSS.Component.BasicTransform
+        order = []
+        parents = []
+        transOrder = []
+        transParents = []
+
+        roots = [self._entity_pool[entity_id] for entity_id in self._entity_ids 
+                 if self._entity_pool[entity_id].parent is None]
+        if self._root in roots:
+            roots.remove(self._root)
+            roots.insert(0, self._root)
+
+        # other parentless entities, entities or components added directly in the scenegraph
+        # are outside of the dense storage
+        fullyManaged = roots == [self._root]
+
+        # stack of (entity, position of its parent in order, row of its parent BasicTransform)
+        stack = [(root, -1, -1) for root in reversed(roots)]
+        while stack:
+            entity, parentPos, parentTransRow = stack.pop()
+            if entity.row is None:
+                fullyManaged = False
+            else:
+                if fullyManaged:
+                    fullyManaged = all(self.getComponent(entity, type(child)) is child 
+                                       for child in entity._children if not isinstance(child, Entity))
+                position = len(order)
+                order.append(entity.row)
+                parents.append(parentPos)
+                trans = self.getComponent(entity, BasicTransform)
+                if trans is not None:
+                    transOrder.append(trans.row)
+                    transParents.append(parentTransRow)
+                    parentTransRow = trans.row
+                parentPos = position
+            # entities not created in this ECSSManager are skipped, but their children are not
+            children = [child for child in entity._children if isinstance(child, Entity)]
+            for child in reversed(children):
+                stack.append((child, parentPos, parentTransRow))
+
+        self._dfs_order = np.array(order, dtype=np.int32)
+        self._parent_row = np.array(parents, dtype=np.int32)
+        self._transform_order = np.array(transOrder, dtype=np.int32)
+        self._transform_parent = np.array(transParents, dtype=np.int32)
+        self._fully_managed = fullyManaged
+
+    def _registerEntity(self, entity: Entity):
+        """
+        Gives an entity the next dense id and adds it in the archetype without components
+        """
+        entity_id = len(self._entity_pool)
+        entity.row = entity_id
+        entity.worldManager = self
+        if entity_id == len(self._child_count):
+            self._child_count = np.concatenate((self._child_count, np.zeros_like(self._child_count)))
+        # the entity may already have children added directly in the scenegraph
+        self._child_count[entity_id] = len(entity._children)
+        self._entity_ids.append(entity_id)
+        self._entity_pool.append(entity)
+        self._addToArchetype(entity_id, {})
+        self.invalidateTraversal()
+
+    def _addToComponents(self, entity: Entity, component: pyglGA.ECSS.Component.Component):
+        """
+        Adds a component in the generic _components
+        """
+        self._components[component] = None
+
+    def _removeFromComponents(self, component: pyglGA.ECSS.Component.Component):
+        """
+        Removes a component from the generic _components
+        """
+        del self._components[component]
+
+    def _addCamera(self, entity: Entity, camera: pyglGA.ECSS.Component.Camera):
+        """
+        Adds a camera component and the dense id of its entity in the camera lists, 
+        and binds it to a new row of the CameraSoA
+        """
+        count = len(self._cameras)
+        if count == len(self._camera_ids):
+            self._camera_ids = np.concatenate((self._camera_ids, np.empty_like(self._camera_ids)))
+        self._camera_ids[count] = entity.row
+        self._cameras.append(camera)
+        camera.bind(self, self._camera_soa.addRow())
+        self._cameras_stale = True
+
+    def _removeCamera(self, camera: pyglGA.ECSS.Component.Camera):
+        """
+        Removes a camera component and the dense id of its entity from the camera lists,
+        moving the last camera in its place
+        """
+        index = camera.row
+        camera.unbind()
+        moved = self._camera_soa.removeRow(index)
+        last = len(self._cameras) - 1
+        self._camera_ids[index] = self._camera_ids[last]
+        self._cameras[index] = self._cameras[last]
+        self._cameras.pop()
+        if moved is not None:
+            self._cameras[index]._row = index
+        self._cameras_stale = True
+
+    def updateCameras(self):
+        """
+        Calculates the root2cam (view-projection) matrices of all cameras at once, 
+        from the l2world matrices of their entities' BasicTransforms: 
+        view = inverse(l2world) and root2cam = view @ proj.
+
+        Has to run after the l2world matrices are calculated, e.g. by a TransformSystem.
+        A camera whose entity has no BasicTransform gets an identity root2cam.
+        """
+        self._cameras_stale = False
+        soa = self._camera_soa
+        count = soa.size
+        if count == 0:
+            return
+        view = soa.view_buf[:count]
+        transforms = [self.getComponent(self._entity_pool[entity_id], pyglGA.ECSS.Component.BasicTransform) 
+                      for entity_id in self._camera_ids[:count]]
+        has_transform = np.array([trans is not None for trans in transforms])
+        rows = [trans.row for trans in transforms if trans is not None]
+        view[:] = np.identity(4)
+        if rows:
+            view[has_transform] = np.linalg.inv(self._transform_soa.l2w_buf[rows])
+        soa.updateViewProjection()
+        soa.vp_buf[:count][~has_transform] = np.identity(4)
+
+    def refreshCameras(self):
+        """
+        Calls updateCameras() only if a TransformSystem traversal ran or cameras were added or removed 
+        since the last update, so that visiting K cameras in a frame calculates their root2cam once.
+
+        l2world or projection matrices changed directly, outside of a TransformSystem, 
+        need an explicit updateCameras().
+        """
+        if self._cameras_stale:
+            self.updateCameras()
+
+    def _addToArchetype(self, entity_id: int, components: Dict):
+        """
+        Appends a row for an entity in the archetype matching its component types, 
+        creating that archetype if it does not exist yet
+        """
+        key = frozenset(components)
+        archetype = self._archetypes.get(key)
+        if archetype is None:
+            archetype = Archetype(key)
+            self._archetypes[key] = archetype
+            # the set of archetypes changed, so systems have to bind their columns again
+            self._archetype_generation += 1
+        self._entity_index[entity_id] = (archetype, archetype.addRow(entity_id, components))
+
+    def _detachComponent(self, owner: Entity, component: pyglGA.ECSS.Component.Component):
+        """
+        Removes a component from the Entity it was added to, from the ECSSManager lists 
+        and from the dense storage, so that it can be added to another Entity
+        """
+        compType = type(component)
+        if owner.row is not None and self.getComponent(owner, compType) is component:
+            components = self._removeFromArchetype(owner.row)
+            del components[compType]
+            self._addToArchetype(owner.row, components)
+            self.getPool(compType)[1](self, component)
+            if compType is pyglGA.ECSS.Component.BasicTransform:
+                self._releaseTransformRow(component)
+        owner.remove(component)
+
+    def _releaseTransformRow(self, transform: pyglGA.ECSS.Component.BasicTransform):
+        """
+        Unbinds a BasicTransform and frees its TransformSoA row, moving the last row in its place
+        """
+        row = transform.row
+        transform.unbind()
+        moved = self._transform_soa.removeRow(row)
+        if moved is not None:
+            for component in self._components:
+                if isinstance(component, pyglGA.ECSS.Component.BasicTransform) and component.row == moved:
+                    component._row = row
+                    break
+        self.invalidateTraversal()
+
+    def _removeFromArchetype(self, entity_id: int) -> Dict:
+        """
+        Removes the row of an entity from its archetype and returns its components.
+        The entity that was moved into the freed row gets its index patched.
+        """
+        archetype, row = self._entity_index.pop(entity_id)
+        moved_id, components = archetype.removeRow(row)
+        if moved_id is not None:
+            self._entity_index[moved_id] = (archetype, row)
+        return components
+
     def addEntityChild(self, entity_parent: Entity, entity_child: Entity):
         """
         Adds a child Enity to a parent one and thus establishes a hierarchy 
         in the underlying scenegraph.
 
-        Adds the child Entity also in the ECSS _entities_components dictionary 
-        data structure, so that the hierarchy is also visible at ECSSManager level.
+        The hierarchy is kept only in the scenegraph, since the ECSSManager archetypes 
+        store just the components of each Entity.
 
         :param entity_parent: [description]
         :type entity_parent: Entity
@@ -216,18 +588,129 @@ class ECSSManager():
             if entity_child.getParent() is not entity_parent:
                 # if not, create one
                 entity_parent.add(entity_child)
-            # add entity_child in the _entities_components dictionary
-            # loop through all dictionary elements of _entities_components
-            for key, value in self._entities_components.items():
-                if key is entity_parent:  # find key [entity]
-                    if (value[0] == None):
-                        # replace None with the entity_child
-                        value[0] = entity_child
-                    else:
-                        # just add entity_child in the children's components list
-                        value.append(entity_child)
+            # the flattened hierarchy has to be rebuilt
+            self.invalidateTraversal()
 
     
+    @staticmethod
+    def _buildDispatch() -> Dict[Tuple[type, type], Callable]:
+        """
+        Builds the dispatch table of the built-in Components and Systems, 
+        replacing the double dispatch of Component.accept()
+        """
+        Component = pyglGA.ECSS.Component
+        System = pyglGA.ECSS.System
+        return {
+            (Component.BasicTransform, System.TransformSystem): System.TransformSystem.apply2BasicTransform,
+            (Component.BasicTransform, System.CameraSystem): System.CameraSystem.applyCamera2BasicTransform,
+            (Component.Camera, System.CameraSystem): System.CameraSystem.apply2Camera,
+            (Component.RenderMesh, System.RenderSystem): System.RenderSystem.apply2RenderMesh,
+        }
+
+    @staticmethod
+    def _buildPools() -> Dict[type, Tuple[Callable, Callable]]:
+        """
+        Builds the table of the built-in Component types that are kept in their own list
+        """
+        return {
+            pyglGA.ECSS.Component.Camera: (ECSSManager._addCamera, ECSSManager._removeCamera),
+        }
+
+    def registerPool(self, compType: type, add: Callable, remove: Callable):
+        """
+        Registers the methods add(worldManager, entity, component) and remove(worldManager, component)
+        that keep the Components of compType in their own list, e.g. a list of Lights.
+
+        Components of compType (or its subclasses) already added are moved from the list
+        they were kept in before, e.g. the generic _components or the _cameras, to the new list.
+        """
+        previousPools = []
+        for archetype in self._archetypes.values():
+            for columnType, column in archetype.columns.items():
+                if issubclass(columnType, compType):
+                    previousPools.append((columnType, self.getPool(columnType), list(column)))
+        self._pool_for_type[compType] = (add, remove)
+        self._pool_cache.clear()
+        for columnType, (previousAdd, previousRemove), components in previousPools:
+            if self.getPool(columnType) == (previousAdd, previousRemove):
+                continue
+            for component in components:
+                previousRemove(self, component)
+                add(self, component.parent, component)
+
+    def getPool(self, compType: type) -> Tuple[Callable, Callable]:
+        """
+        Returns the (add, remove) methods registered for a Component type or its nearest base class,
+        the ones of the generic _components if there are none
+        """
+        pool = self._pool_cache.get(compType)
+        if pool is None:
+            for baseType in compType.__mro__:
+                pool = self._pool_for_type.get(baseType)
+                if pool is not None:
+                    break
+            else:
+                pool = (ECSSManager._addToComponents, ECSSManager._removeFromComponents)
+            self._pool_cache[compType] = pool
+        return pool
+
+    def registerDispatch(self, compType: type, systemType: type, method: Callable):
+        """
+        Registers the System method, e.g. MySystem.apply2MyComponent, that is called 
+        when a System of systemType processes a Component of compType
+        """
+        self._dispatch[(compType, systemType)] = method
+
+    def getDispatch(self, compType: type, systemType: type) -> Callable:
+        """
+        Returns the System method registered for a Component type and a System type or any of 
+        its base classes, None if there is none.
+        Methods of a base class are resolved on systemType, so that overrides are respected, 
+        other callables, e.g. lambdas, are returned as registered.
+        """
+        method = self._dispatch.get((compType, systemType))
+        if method is None:
+            for baseType in systemType.__mro__[1:]:
+                method = self._dispatch.get((compType, baseType))
+                if method is not None:
+                    name = getattr(method, "__name__", None)
+                    if name is not None and getattr(baseType, name, None) is method:
+                        method = getattr(systemType, name)
+                    self._dispatch[(compType, systemType)] = method
+                    break
+        return method
+
+    def bind(self, system: pyglGA.ECSS.System.System):
+        """
+        Caches in the System the archetype columns of its requiredTypes, 
+        one tuple of columns per archetype that has all of these types.
+
+        The columns are live lists of the archetypes, so they only have to be bound again 
+        when a new archetype is created, i.e. when the archetype_generation stored in the System 
+        is older than the current one.
+
+        :param system: the System to bind
+        :type system: System
+        """
+        requiredTypes = system.requiredTypes
+        cachedColumns = []
+        for archetype in self._archetypes.values():
+            if archetype.component_types.issuperset(requiredTypes):
+                cachedColumns.append(tuple(archetype.columns[compType] for compType in requiredTypes))
+        system.cachedColumns = cachedColumns
+        system.cachedGeneration = self._archetype_generation
+        return cachedColumns
+
+    def freeze(self):
+        """
+        Moves all objects tracked by the garbage collector, including the scenegraph built so far,
+        to its permanent generation, so that the collections during the main loop do not scan them again.
+
+        Call it once, after the scenegraph is built and before the main loop.
+        """
+        gc.collect()
+        gc.freeze()
+
     def traverse_visit_pre_camera(self, camUpdate: pyglGA.ECSS.System, camera: pyglGA.ECSS.Component.Camera):
         """
         Specifically run a CameraSystem on a Camera Component attached in a scenecegraph, 
@@ -236,7 +719,11 @@ class ECSSManager():
         This visitor has to be accepted after the L2W traversal has completed and has to be part of the
         cameraUpdate  system that will traverse whole scenegraph afterwards
         """
-        camera.accept(camUpdate)
+        method = self.getDispatch(type(camera), type(camUpdate))
+        if method is not None:
+            method(camUpdate, camera)
+        else:
+            camera.accept(camUpdate)
     
     
     def traverse_visit(self, system: pyglGA.ECSS.System, entity: Entity, dfs=True):
@@ -244,12 +731,52 @@ class ECSSManager():
         Traverse whole scenegraph by iterating every Entity/Component and calling 
         a specific System on each different element.   
 
+        Systems with requiredTypes get apply2Components() called once per Entity that has 
+        all of these types. Traversing from the root of a scenegraph fully built via the ECSSManager, 
+        they do not visit the scenegraph, instead they sweep their cached archetype columns, 
+        unless their applyBatch() processes all the dense ECSSManager buffers at once.
+        Traversing a subtree, they visit only the Entities of that subtree.
+        Components with a method in the dispatch table for this System are processed 
+        by that method, instead of accept().
+
         :param system: [description]
         :type system: System.System
         :param iterator: [description]
         :type iterator: Iterator
         """
 
+        if isinstance(system, pyglGA.ECSS.System.TransformSystem):
+            # the l2world matrices change, so the cameras' root2cam have to be calculated again
+            self._cameras_stale = True
+        elif isinstance(system, pyglGA.ECSS.System.RenderSystem):
+            # each traversal emits the draw commands of a new frame, 
+            # drop the ones of the previous frame if it did not flush() them
+            self._command_buffer.clear()
+        if isinstance(system, pyglGA.ECSS.System.System) and system.requiredTypes:
+            tic1 = time.perf_counter()
+            if __debug__:
+                log.debug("this is the %s traversal START", system.name)
+            if entity is not self._root or not self.fully_managed:
+                # a subtree, or a scenegraph partly built outside of the ECSSManager
+                self._sweepScenegraph(system, entity)
+            elif not system.applyBatch(self):
+                if system.cachedColumns is None or system.cachedGeneration != self._archetype_generation:
+                    self.bind(system)
+                method = None
+                if len(system.requiredTypes) == 1:
+                    method = self.getDispatch(system.requiredTypes[0], type(system))
+                for columns in system.cachedColumns:
+                    if method is not None:
+                        for comp in columns[0]:
+                            method(system, comp)
+                    else:
+                        for row in range(len(columns[0])):
+                            system.apply2Components(*[column[row] for column in columns])
+            toc1 = time.perf_counter()
+            if __debug__:
+                log.debug("%s traversal took %0.4f msecs", system.name, (toc1 - tic1)*1000)
+            return
+
         iterator = None
         try:
             if dfs:
@@ -259,50 +786,101 @@ class ECSSManager():
 
         if isinstance(system, pyglGA.ECSS.System.System) and iterator is not None:
             tic1 = time.perf_counter()
-            print(f"\nthis is the {system.name} traversal START".center(100, '-'))
+            if __debug__:
+                log.debug("this is the %s traversal START", system.name)
+            # dispatch table methods of this System per Component type, looked up once
+            methods = {}
+            systemType = type(system)
             done_traversing = False
             while(not done_traversing):
                 try:
                     traversedComp = next(iterator)
                 except StopIteration:
-                    print("\n--- end of Scene reached, traversed all Components!---")
+                    if __debug__:
+                        log.debug("--- end of Scene reached, traversed all Components!---")
                     done_traversing = True
                 else:
                     # only if we reached end of Entity's children traversedComp is None
                     if (traversedComp is not None):
                         #print(traversedComp)
-                        # accept a visitor System for each Component that can accept it
-                        # calls specific concrete Visitor's apply2Component(), which calls specific concrete Component's methods
-                        traversedComp.accept(system)
+                        compType = type(traversedComp)
+                        if compType not in methods:
+                            methods[compType] = self.getDispatch(compType, systemType)
+                        method = methods[compType]
+                        if method is not None:
+                            method(system, traversedComp)
+                        else:
+                            # accept a visitor System for each Component that can accept it
+                            # calls specific concrete Visitor's apply2Component(), which calls specific concrete Component's methods
+                            traversedComp.accept(system)
 
             toc1 = time.perf_counter()
-            print(
-                f"\n{system.name} traversal took {(toc1 - tic1)*1000:0.4f} msecs".center(100, '-'))
+            if __debug__:
+                log.debug("%s traversal took %0.4f msecs", system.name, (toc1 - tic1)*1000)
+
+    def _sweepScenegraph(self, system: pyglGA.ECSS.System.System, entity: Entity):
+        """
+        Calls a System with requiredTypes on the Entities of the subtree of entity, in depth-first pre-order, 
+        walking the scenegraph instead of the archetype columns
+        """
+        requiredTypes = system.requiredTypes
+        method = None
+        if len(requiredTypes) == 1:
+            method = self.getDispatch(requiredTypes[0], type(system))
+        stack = [entity]
+        while stack:
+            node = stack.pop()
+            children = node._children
+            if len(requiredTypes) == 1:
+                for child in children:
+                    if type(child) is requiredTypes[0]:
+                        if method is not None:
+                            method(system, child)
+                        else:
+                            system.apply2Components(child)
+            else:
+                components = [next((child for child in children if type(child) is compType), None) 
+                              for compType in requiredTypes]
+                if None not in components:
+                    system.apply2Components(*components)
+            stack.extend(reversed([child for child in children if isinstance(child, Entity)]))
 
     def print(self):
         """
         pretty print the contents of the ECSS
+
+        All lines are accumulated in one buffer and written to stdout at once
         """
-        print("_entities_components {}".center(100, '-'))
-        # pprint.pprint(self._entities_components)
-        for en, co in self._entities_components.items():
-            print(f"{en.name}")
-            for comp in co:
-                if comp is not None:
-                    print(f"\t :: {comp.name}")
-
-        print("_entities []".center(100, '-'))
-        for ent in self._entities:
-            print(ent)
-        print("_components []".center(100, '-'))
-        for com in self._components:
-            print(com.name, "<--", com.parent.name)
-        print("_systems []".center(100, '-'))
-        for sys in self._systems:
-            print(sys)
-        print("_cameras []".center(100, '-'))
-        for cam in self._cameras:
-            print(cam)
+        getName = operator.attrgetter('name')
+        out = io.StringIO()
+        out.write("entities_components {}".center(100, '-'))
+        out.write("\n")
+        for entity_id in self._entity_ids:
+            archetype, row = self._entity_index[entity_id]
+            out.write(self._entity_pool[entity_id].name)
+            out.write("\n")
+            out.writelines(f"\t :: {name}\n" for name in map(getName, archetype.getRow(row).values()))
+
+        out.write("_entity_pool []".center(100, '-'))
+        out.write("\n")
+        out.write("\n".join(str(self._entity_pool[entity_id]) for entity_id in self._entity_ids))
+        out.write("\n")
+        out.write("_components []".center(100, '-'))
+        out.write("\n")
+        out.writelines(f"{com.name} <-- {com.parent.name}\n" for com in self._components)
+        out.write("_archetypes {}".center(100, '-'))
+        out.write("\n")
+        out.write("\n".join(map(str, self._archetypes.values())))
+        out.write("\n")
+        out.write("_systems []".center(100, '-'))
+        out.write("\n")
+        out.write("\n".join(map(str, self._systems)))
+        out.write("\n")
+        out.write("_cameras []".center(100, '-'))
+        out.write("\n")
+        out.write("\n".join(map(str, self._cameras)))
+        out.write("\n")
+        sys.stdout.write(out.getvalue())
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Iterable, Iterator
 from typing import Any, List
 import uuid
+import weakref
 
 from pyglGA.ECSS.Component import Component, ComponentIterator
 from pyglGA.ECSS.System import System
@@ -68,6 +69,8 @@ class Entity(Component):
     It is an actual data aggregator container of Components. All the actuall operations and logic is performed by 
     Systems and not the Components or Entity itself.
     """
+    
+    __slots__ = ('_row', '_children')
 
     def __init__(self, name=None, type=None, id=None) -> None:
         """
@@ -78,7 +81,25 @@ class Entity(Component):
         super().__init__(name, type, id)
         
         self._children: List[Component]=[]
-        self._parent = None
+        # dense id of this Entity in the ECSSManager, None while it is not created there
+        self._row = None
+    
+    @property #parent
+    def parent(self) -> Entity:
+        """ Get Entity's parent, None for a root Entity """
+        parent = self._parent
+        return None if parent is None else parent()
+    @parent.setter
+    def parent(self, value):
+        self._parent = None if value is None else weakref.ref(value)
+    
+    @property #row
+    def row(self) -> int:
+        """ Get Entity's dense id in the ECSSManager """
+        return self._row
+    @row.setter
+    def row(self, value):
+        self._row = value
         
     
     def print(self):
@@ -103,11 +124,21 @@ class Entity(Component):
 
     def add(self, object: Component) ->None:
         self._children.append(object)
-        object._parent = self
+        object.parent = self
+        if self._worldManager is not None:
+            self._worldManager.child_count[self._row] += 1
+            # the flattened scenegraph changes with child Entities and components not added via the ECSSManager
+            if isinstance(object, Entity) or self._worldManager.getComponent(self, type(object)) is not object:
+                self._worldManager.invalidateTraversal()
 
     def remove(self, object: Component) ->None:
         self._children.remove(object)
-        object._parent = None
+        object.parent = None
+        if self._worldManager is not None:
+            self._worldManager.child_count[self._row] -= 1
+            # the flattened scenegraph changes with child Entities and components not added via the ECSSManager
+            if isinstance(object, Entity) or self._worldManager.getComponent(self, type(object)) is not object:
+                self._worldManager.invalidateTraversal()
         
     def getChild(self, index) ->Component:
         if index < len(self._children):
@@ -122,10 +153,16 @@ class Entity(Component):
         return None
     
     def getParent(self) ->Component:
-            return self._parent
+            return self.parent
     
     def getNumberOfChildren(self) -> int:
-        return len(self._children)
+        """
+        Get the number of children (Entities and Components), read from the dense 
+        child count column of the ECSSManager once the Entity is created there
+        """
+        if self._worldManager is None:
+            return len(self._children)
+        return int(self._worldManager.child_count[self._row])
     
     
     def isEntity(self) -> bool:
@@ -162,8 +199,8 @@ class Entity(Component):
         return EntityDfsIterator(self)
     
     def __str__(self):
-        if (self._parent is not None): #in case this is not the root node
-            return f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self._parent._name}"
+        if (self.parent is not None): #in case this is not the root node
+            return f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: {self.parent.name}"
         else:
             return f"\n {self.getClassName()} name: {self._name}, type: {self._type}, id: {self._id}, parent: None (root node)"
 
@@ -0,0 +1,371 @@
+"""
+Storage classes, part of the glGA SDK ECSS
+
+glGA SDK v2021.0.5 ECSS (Entity Component System in a Scenegraph)
+@Coopyright 2020-2021 George Papagiannakis
+
+The Storage classes are the dense, Structure-of-Arrays (SoA) data containers that the
+ECSSManager uses to hold Components next to each other, instead of scattered per Entity.
+
+An Archetype groups all Entities that share exactly the same set of Component types, and keeps
+one contiguous column (list) per Component type, so that Systems can sweep a single
+typed column at a time:
+    • https://github.com/skypjack/entt/wiki/Crash-Course:-entity-component-system
+    • https://ajmmertens.medium.com/building-an-ecs-2-archetypes-and-vectorization-fe21690805f9
+
+The TransformSoA keeps the matrices of all BasicTransform Components in contiguous (capacity,4,4) 
+numpy buffers, so that Systems can update all of them with batched matrix multiplications.
+The CameraSoA does the same for the projection, view and view-projection matrices of all Cameras.
+
+The CommandBuffer collects one draw command per RenderMesh in a structured numpy array, 
+sorted by material and vertex array before submission, so that a rendering backend can issue 
+one multi-draw call per material instead of one draw call per Entity.
+
+"""
+
+from __future__ import annotations
+from typing import List, Dict, Tuple, FrozenSet
+
+import numpy as np
+
+
+class Archetype():
+    """
+    Table of all Entities that have exactly the same set of Component types.
+
+    Each row of the table is one Entity, each column holds all Components of a single type.
+    Rows are kept packed: removing a row moves the last row in its place (swap-remove).
+    """
+
+    def __init__(self, component_types: FrozenSet[type] = frozenset()):
+        self._component_types: FrozenSet[type] = frozenset(component_types)
+        # one contiguous list per Component type
+        self._columns: Dict[type, List] = {compType: [] for compType in self._component_types}
+        # the entity id stored in each row
+        self._entity_ids: List[int] = []
+
+    #define properties for component_types, columns, entity_ids
+    @property #component_types
+    def component_types(self) -> FrozenSet[type]:
+        """ Get Archetype's set of Component types """
+        return self._component_types
+
+    @property #columns
+    def columns(self) -> Dict[type, List]:
+        """ Get Archetype's Component columns, one list per Component type """
+        return self._columns
+
+    @property #entity_ids
+    def entity_ids(self) -> List[int]:
+        """ Get Archetype's entity id per row """
+        return self._entity_ids
+
+    def addRow(self, entity_id: int, components: Dict[type, object]) -> int:
+        """
+        Appends a new row at the end of the table
+
+        :param entity_id: the id of the Entity that owns this row
+        :type entity_id: int
+        :param components: one Component per Component type of this Archetype
+        :type components: Dict[type, Component]
+        :return: the index of the new row
+        :rtype: int
+        """
+        for compType, column in self._columns.items():
+            column.append(components[compType])
+        self._entity_ids.append(entity_id)
+        return len(self._entity_ids) - 1
+
+    def removeRow(self, row: int) -> Tuple[int, Dict[type, object]]:
+        """
+        Removes a row by moving the last row in its place, so that the columns stay packed
+
+        :param row: the index of the row to remove
+        :type row: int
+        :return: the entity id that was moved into row (None if no row was moved)
+            and the Components of the removed row
+        :rtype: Tuple[int, Dict[type, Component]]
+        """
+        last = len(self._entity_ids) - 1
+        components = {}
+        for compType, column in self._columns.items():
+            components[compType] = column[row]
+            column[row] = column[last]
+            column.pop()
+
+        moved_id = self._entity_ids[last]
+        self._entity_ids[row] = moved_id
+        self._entity_ids.pop()
+
+        if row == last:
+            moved_id = None
+        return moved_id, components
+
+    def getRow(self, row: int) -> Dict[type, object]:
+        """
+        Get all Components of a row, keyed by their Component type
+        """
+        return {compType: column[row] for compType, column in self._columns.items()}
+
+    def __len__(self):
+        return len(self._entity_ids)
+
+    def __str__(self):
+        typeNames = [compType.__name__ for compType in self._component_types]
+        return f"\n Archetype types: {typeNames}, rows: {len(self._entity_ids)}"
+
+
+class TransformSoA():
+    """
+    Contiguous trs, l2world and l2cam matrix buffers of all BasicTransform Components.
+
+    Each BasicTransform bound to the ECSSManager owns one row of the buffers, 
+    unused rows are kept to the identity matrix.
+    """
+
+    def __init__(self, capacity=64):
+        self._size = 0
+        self._trs_buf = TransformSoA._identities(capacity)
+        self._l2w_buf = TransformSoA._identities(capacity)
+        self._l2c_buf = TransformSoA._identities(capacity)
+
+    #define properties for trs_buf, l2w_buf, l2c_buf, size, capacity
+    @property #trs_buf
+    def trs_buf(self) -> np.ndarray:
+        """ Get the (capacity,4,4) buffer of trs matrices """
+        return self._trs_buf
+
+    @property #l2w_buf
+    def l2w_buf(self) -> np.ndarray:
+        """ Get the (capacity,4,4) buffer of local to world matrices """
+        return self._l2w_buf
+
+    @property #l2c_buf
+    def l2c_buf(self) -> np.ndarray:
+        """ Get the (capacity,4,4) buffer of local to camera matrices """
+        return self._l2c_buf
+
+    @property #size
+    def size(self) -> int:
+        """ Get the number of rows in use """
+        return self._size
+
+    @property #capacity
+    def capacity(self) -> int:
+        """ Get the number of allocated rows """
+        return self._trs_buf.shape[0]
+
+    @staticmethod
+    def _identities(capacity) -> np.ndarray:
+        buf = np.zeros((capacity, 4, 4))
+        buf[:, [0, 1, 2, 3], [0, 1, 2, 3]] = 1.0
+        return buf
+
+    def addRow(self, trs=None, l2world=None, l2cam=None) -> int:
+        """
+        Allocates a new row, doubling the buffers capacity if they are full
+
+        :return: the index of the new row
+        :rtype: int
+        """
+        if self._size == self.capacity:
+            capacity = 2 * self.capacity
+            for name in ("_trs_buf", "_l2w_buf", "_l2c_buf"):
+                buf = TransformSoA._identities(capacity)
+                buf[:self._size] = getattr(self, name)
+                setattr(self, name, buf)
+        row = self._size
+        self._size += 1
+        self.setRow(row, trs, l2world, l2cam)
+        return row
+
+    def setRow(self, row: int, trs=None, l2world=None, l2cam=None):
+        """
+        Copies the given matrices in a row, the missing ones are set to identity
+        """
+        for buf, mat in ((self._trs_buf, trs), (self._l2w_buf, l2world), (self._l2c_buf, l2cam)):
+            buf[row] = np.identity(4) if mat is None else mat
+
+    def removeRow(self, row: int) -> int:
+        """
+        Removes a row by moving the last row in its place
+
+        :param row: the index of the row to remove
+        :type row: int
+        :return: the index of the row that was moved into row (None if no row was moved)
+        :rtype: int
+        """
+        last = self._size - 1
+        for buf in (self._trs_buf, self._l2w_buf, self._l2c_buf):
+            buf[row] = buf[last]
+            buf[last] = np.identity(4)
+        self._size = last
+        return None if row == last else last
+
+
+class CameraSoA():
+    """
+    Contiguous projection, view and view-projection matrix buffers of all Camera Components.
+
+    Each Camera bound to the ECSSManager owns one row of the buffers, 
+    following the same l2cam = l2world @ root2cam convention of the BasicTransforms:
+    the view-projection (root2cam) matrix of a row is view @ proj.
+    Rows are kept packed: removing a row moves the last row in its place (swap-remove).
+    """
+
+    def __init__(self, capacity=8):
+        self._size = 0
+        self._proj_buf = TransformSoA._identities(capacity)
+        self._view_buf = TransformSoA._identities(capacity)
+        self._vp_buf = TransformSoA._identities(capacity)
+
+    #define properties for proj_buf, view_buf, vp_buf, size, capacity
+    @property #proj_buf
+    def proj_buf(self) -> np.ndarray:
+        """ Get the (capacity,4,4) buffer of projection matrices """
+        return self._proj_buf
+
+    @property #view_buf
+    def view_buf(self) -> np.ndarray:
+        """ Get the (capacity,4,4) buffer of view (inverse camera l2world) matrices """
+        return self._view_buf
+
+    @property #vp_buf
+    def vp_buf(self) -> np.ndarray:
+        """ Get the (capacity,4,4) buffer of view-projection (root2cam) matrices """
+        return self._vp_buf
+
+    @property #size
+    def size(self) -> int:
+        """ Get the number of rows in use """
+        return self._size
+
+    @property #capacity
+    def capacity(self) -> int:
+        """ Get the number of allocated rows """
+        return self._proj_buf.shape[0]
+
+    def addRow(self, proj=None, view=None, vp=None) -> int:
+        """
+        Allocates a new row, doubling the buffers capacity if they are full
+
+        :return: the index of the new row
+        :rtype: int
+        """
+        if self._size == self.capacity:
+            capacity = 2 * self.capacity
+            for name in ("_proj_buf", "_view_buf", "_vp_buf"):
+                buf = TransformSoA._identities(capacity)
+                buf[:self._size] = getattr(self, name)
+                setattr(self, name, buf)
+        row = self._size
+        self._size += 1
+        self.setRow(row, proj, view, vp)
+        return row
+
+    def setRow(self, row: int, proj=None, view=None, vp=None):
+        """
+        Copies the given matrices in a row, the missing ones are set to identity
+        """
+        for buf, mat in ((self._proj_buf, proj), (self._view_buf, view), (self._vp_buf, vp)):
+            buf[row] = np.identity(4) if mat is None else mat
+
+    def removeRow(self, row: int) -> int:
+        """
+        Removes a row by moving the last row in its place
+
+        :param row: the index of the row to remove
+        :type row: int
+        :return: the index of the row that was moved into row (None if no row was moved)
+        :rtype: int
+        """
+        last = self._size - 1
+        for buf in (self._proj_buf, self._view_buf, self._vp_buf):
+            buf[row] = buf[last]
+            buf[last] = np.identity(4)
+        self._size = last
+        return None if row == last else last
+
+    def updateViewProjection(self):
+        """
+        Calculates the view-projection matrices of all rows 
+        with one batched matrix multiplication: vp = view @ proj
+        """
+        size = self._size
+        np.matmul(self._view_buf[:size], self._proj_buf[:size], out=self._vp_buf[:size])
+
+
+# one draw command: vertex array, number of indices, TransformSoA row of the instance, material
+cmd_dtype = np.dtype([('vao_id', np.int32), ('index_count', np.int32), 
+                      ('instance_id', np.int32), ('material_id', np.int32)])
+
+
+class CommandBuffer():
+    """
+    Draw commands of RenderMesh Components, stored in a contiguous structured array of cmd_dtype.
+
+    The instance_id of a command is the TransformSoA row of its Entity's BasicTransform 
+    (-1 if it has none), so that the model matrices of a batch are rows of the l2w_buf.
+    """
+
+    def __init__(self, capacity=64):
+        self._size = 0
+        self._commands = np.zeros(capacity, dtype=cmd_dtype)
+
+    #define properties for commands, size, capacity
+    @property #commands
+    def commands(self) -> np.ndarray:
+        """ Get the commands in use """
+        return self._commands[:self._size]
+
+    @property #size
+    def size(self) -> int:
+        """ Get the number of commands in use """
+        return self._size
+
+    @property #capacity
+    def capacity(self) -> int:
+        """ Get the number of allocated commands """
+        return self._commands.shape[0]
+
+    def append(self, vao_id: int, index_count: int, instance_id: int = -1, material_id: int = 0) -> int:
+        """
+        Appends a draw command, doubling the buffer capacity if it is full
+
+        :return: the index of the new command
+        :rtype: int
+        """
+        if self._size == self.capacity:
+            commands = np.zeros(2 * self.capacity, dtype=cmd_dtype)
+            commands[:self._size] = self._commands
+            self._commands = commands
+        index = self._size
+        self._commands[index] = (vao_id, index_count, instance_id, material_id)
+        self._size += 1
+        return index
+
+    def clear(self):
+        """
+        Drops all commands, keeping the allocated buffer
+        """
+        self._size = 0
+
+    def sort(self):
+        """
+        Sorts the commands in place by material, then by vertex array
+        """
+        self._commands[:self._size].sort(order=['material_id', 'vao_id'])
+
+    def batches(self):
+        """
+        Splits the sorted commands in one contiguous batch per material
+
+        :return: iterator of (material_id, commands of that material)
+        :rtype: Iterator[Tuple[int, np.ndarray]]
+        """
+        commands = self.commands
+        if self._size == 0:
+            return
+        starts = np.flatnonzero(np.diff(commands['material_id'])) + 1
+        for batch in np.split(commands, starts):
+            yield int(batch['material_id'][0]), batch
@@ -16,12 +16,17 @@ The following is example restructured text doc example
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
+import logging
+
+import numpy as np
 
 import pyglGA.ECSS.Component
 import pyglGA.ECSS.utilities as util
 import uuid  
 
+log = logging.getLogger(__name__)
+
 class System(ABC):
     """
     Main abstract class of the System part of our ECS
@@ -50,8 +55,15 @@ class System(ABC):
         else:
             self._id = id
         self._priority = priority
-    
-    #define properties for id, name, type, priority
+        # Component types this System sweeps over, in the order passed to apply2Components()
+        # an empty tuple means the System visits the scenegraph instead
+        self._requiredTypes: Tuple[type, ...] = ()
+        # archetype columns of the requiredTypes, bound by ECSSManager.bind()
+        self._cachedColumns: List[Tuple[List, ...]] = None
+        # ECSSManager archetype_generation the cachedColumns were bound at
+        self._cachedGeneration: int = None
+    
+    #define properties for id, name, type, priority, requiredTypes, cachedColumns, cachedGeneration
      
     @property #name
     def name(self) -> str:
@@ -85,6 +97,27 @@ class System(ABC):
     def priority(self, value):
         self._priority = value
     
+    @property #requiredTypes
+    def requiredTypes(self) -> Tuple[type, ...]:
+        """ Get Systems's required Component types """
+        return self._requiredTypes
+    
+    @property #cachedColumns
+    def cachedColumns(self) -> List[Tuple[List, ...]]:
+        """ Get Systems's cached archetype columns, one tuple of columns per matching archetype """
+        return self._cachedColumns
+    @cachedColumns.setter
+    def cachedColumns(self, value):
+        self._cachedColumns = value
+    
+    @property #cachedGeneration
+    def cachedGeneration(self) -> int:
+        """ Get Systems's ECSSManager archetype generation of the cachedColumns """
+        return self._cachedGeneration
+    @cachedGeneration.setter
+    def cachedGeneration(self, value):
+        self._cachedGeneration = value
+    
     @classmethod
     def getClassName(cls):
         return cls.__name__
@@ -114,6 +147,26 @@ class System(ABC):
         pass
     
     
+    def apply2Components(self, *components):
+        """
+        method to be subclassed for  behavioral or logic computation 
+        when sweeping the archetype columns of the requiredTypes. 
+        
+        Called once per Entity, with one Component per required type.
+        """
+        pass
+    
+    def applyBatch(self, worldManager) -> bool:
+        """
+        method to be subclassed for batched computation directly on the 
+        dense ECSSManager buffers, instead of one apply2Components() per Entity. 
+        
+        :return: True if all Components were processed, False to sweep the columns instead
+        :rtype: bool
+        """
+        return False
+    
+    
     def apply2RenderMesh(self, renderMesh: pyglGA.ECSS.Component.RenderMesh, event = None):
         """
         method to be subclassed for  behavioral or logic computation 
@@ -205,6 +258,7 @@ class TransformSystem(System):
     def __init__(self, name=None, type=None, id=None, cameraComponent=None):
         super().__init__(name, type, id)
         self._camera = cameraComponent #if Scene has a cameraComponent, specify also l2Camera
+        self._requiredTypes = (pyglGA.ECSS.Component.BasicTransform,)
         
     
     def update(self):
@@ -264,12 +318,32 @@ class TransformSystem(System):
         #check if the visitor visits a node that it should not
         if (isinstance(basicTransform,pyglGA.ECSS.Component.BasicTransform)) == False:
             return #in Python due to duck typing we need to check this!
-        print(self.getClassName(), ": apply(BasicTransform) called")
+        if __debug__:
+            log.debug("%s: apply(BasicTransform) called", self.getClassName())
         
         # getLocal2World returns result to be set in BasicTransform::update(**kwargs) below
         l2worldTRS = self.getLocal2World(basicTransform)
         #update l2world of basicTransform
         basicTransform.update(l2world=l2worldTRS) 
+    
+    def apply2Components(self, basicTransform: pyglGA.ECSS.Component.BasicTransform):
+        """
+        Called for each BasicTransform of the archetype columns swept by the ECSSManager
+        """
+        self.apply2BasicTransform(basicTransform)
+    
+    def applyBatch(self, worldManager) -> bool:
+        """
+        Calculates the l2world matrices of all BasicTransforms in the ECSSManager TransformSoA, 
+        with one sweep over the flattened scenegraph: l2world = trs @ parent l2world.
+        
+        Subclasses that override apply2BasicTransform are not batched, so that their override is called.
+        """
+        if type(self).apply2BasicTransform is not TransformSystem.apply2BasicTransform:
+            return False
+        soa = worldManager.transformSoA
+        util.update_world(soa.trs_buf, soa.l2w_buf, worldManager.transform_order, worldManager.transform_parent)
+        return True
 
 
 class CameraSystem(System):
@@ -289,6 +363,7 @@ class CameraSystem(System):
     def __init__(self, name=None, type=None, id=None, cameraComponent=None):
         super().__init__(name, type, id)
         self._camera = cameraComponent #if Scene has a cameraComponent, specify also l2Camera
+        self._requiredTypes = (pyglGA.ECSS.Component.BasicTransform,)
     
     def update(self):
         """
@@ -335,14 +410,52 @@ class CameraSystem(System):
         """
         if (isinstance(basicTransform,pyglGA.ECSS.Component.BasicTransform)) == False:
             return #in Python due to duck typing we need to check this!
-        print(self.getClassName(), ": apply(BasicTransform) called from CameraSystem - Calc: Local2Cam")
+        if __debug__:
+            log.debug("%s: apply(BasicTransform) called from CameraSystem - Calc: Local2Cam", self.getClassName())
         
         #l2world of basicTransform has been calculated by the TransformSystem before this System
         l2w = basicTransform.l2world
-        r2c = self._camera.root2cam
-        proj = self._camera.projMat
+        r2c = self.resolveCamera(basicTransform.worldManager).root2cam
         l2c = l2w @ r2c
         basicTransform.update(l2cam=l2c) 
+    
+    def resolveCamera(self, worldManager=None) -> pyglGA.ECSS.Component.Camera:
+        """
+        Returns the Camera of this System, the first camera of the worldManager if none was 
+        given on construction or visited via ECSSManager.traverse_visit_pre_camera().
+        The root2cam of cameras kept by an ECSSManager is brought up to date once per frame.
+
+        :raises RuntimeError: if there is no Camera to use
+        """
+        if self._camera is None:
+            if worldManager is None or not worldManager.cameras:
+                raise RuntimeError(f"{self.name}: CameraSystem has no Camera, pass a cameraComponent "
+                                   "or visit one via ECSSManager.traverse_visit_pre_camera() first")
+            self._camera = worldManager.cameras[0]
+        if self._camera.row is not None:
+            self._camera.worldManager.refreshCameras()
+        return self._camera
+    
+    def apply2Components(self, basicTransform: pyglGA.ECSS.Component.BasicTransform):
+        """
+        Called for each BasicTransform of the archetype columns swept by the ECSSManager,
+        the Camera Component has to be visited first via ECSSManager.traverse_visit_pre_camera()
+        """
+        self.applyCamera2BasicTransform(basicTransform)
+    
+    def applyBatch(self, worldManager) -> bool:
+        """
+        Calculates the l2cam matrices of all BasicTransforms in the ECSSManager TransformSoA, 
+        with one batched matrix multiplication: l2cam = l2world @ root2cam.
+        
+        Subclasses that override applyCamera2BasicTransform are not batched, so that their override is called.
+        """
+        if type(self).applyCamera2BasicTransform is not CameraSystem.applyCamera2BasicTransform:
+            return False
+        size = worldManager.transformSoA.size
+        l2w = worldManager.transformSoA.l2w_buf[:size]
+        np.matmul(l2w, self.resolveCamera(worldManager).root2cam, out=worldManager.transformSoA.l2c_buf[:size])
+        return True
         
     #first this     
     def apply2Camera(self, cam: pyglGA.ECSS.Component.Camera):
@@ -356,12 +469,17 @@ class CameraSystem(System):
         """
         if (isinstance(cam,pyglGA.ECSS.Component.Camera)) == False:
             return #in Python due to duck typing we need to verify this!
-        print(self.getClassName(), ": apply2Camera called from CameraSystem - Calc: Root2Cam")
+        if __debug__:
+            log.debug("%s: apply2Camera called from CameraSystem - Calc: Root2Cam", self.getClassName())
         
-        # getRoot2Cam returns the one component of the Local2Cam = Local2World * Root2Cam
-        r2cam = self.getRoot2Camera(cam)
-        #update root2cam of Camera
-        cam.update(root2cam=r2cam)
+        if cam.row is not None:
+            # the ECSSManager calculates the root2cam of all its cameras in one batched pass, once per frame
+            cam.worldManager.refreshCameras()
+        else:
+            # getRoot2Cam returns the one component of the Local2Cam = Local2World * Root2Cam
+            r2cam = self.getRoot2Camera(cam)
+            #update root2cam of Camera
+            cam.update(root2cam=r2cam)
         #save camera component if not specified on constructor
         self._camera = cam 
 
@@ -369,8 +487,52 @@ class CameraSystem(System):
 
 class RenderSystem(System):
     """
-    A basic, empty forward rendering sample system.
-    Basically this needs to be redefined in each rendering context: OpenGL, RayTracing etc. 
+    A basic forward rendering sample system.
+    
+    Visiting a RenderMesh does not draw it, but appends its draw command in the ECSSManager 
+    CommandBuffer, which ECSSManager.traverse_visit() clears at the start of each RenderSystem traversal. 
+    After the traversal, flush() sorts the commands by material and vertex array 
+    and submits them with one drawBatch() call per material.
+    Basically drawBatch() needs to be redefined in each rendering context: OpenGL, RayTracing etc.,
+    e.g. one glMultiDrawElementsIndirect per material for OpenGL.
     """
-    pass
+    
+    def apply2RenderMesh(self, renderMesh: pyglGA.ECSS.Component.RenderMesh, event = None):
+        """
+        Emits the draw command of a RenderMesh created in an ECSSManager,
+        with its Entity's BasicTransform row as instance id
+        """
+        entity = renderMesh.parent
+        worldManager = None if entity is None else entity.worldManager
+        if worldManager is None:
+            return
+        transform = worldManager.getComponent(entity, pyglGA.ECSS.Component.BasicTransform)
+        renderMesh.emit(worldManager.commandBuffer, -1 if transform is None else transform.row)
+    
+    def flush(self, worldManager) -> int:
+        """
+        Submits all draw commands of the frame, sorted by material and vertex array, 
+        one drawBatch() per material, then clears the CommandBuffer
+
+        :param worldManager: the ECSSManager owning the CommandBuffer
+        :type worldManager: ECSSManager
+        :return: the number of drawBatch() calls
+        :rtype: int
+        """
+        cmdbuf = worldManager.commandBuffer
+        cmdbuf.sort()
+        count = 0
+        for material_id, commands in cmdbuf.batches():
+            self.drawBatch(material_id, commands, worldManager)
+            count += 1
+        cmdbuf.clear()
+        return count
+    
+    def drawBatch(self, material_id: int, commands: np.ndarray, worldManager):
+        """
+        method to be subclassed by each rendering context, to draw all commands of a material.
+        
+        The model matrices of the batch are worldManager.transformSoA.l2w_buf[commands['instance_id']]
+        """
+        pass
                
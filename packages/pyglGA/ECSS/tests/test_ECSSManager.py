@@ -11,7 +11,7 @@ import numpy as np
 
 import pyglGA.ECSS.utilities as util
 from pyglGA.ECSS.Entity import Entity, EntityDfsIterator
-from pyglGA.ECSS.Component import BasicTransform, Camera
+from pyglGA.ECSS.Component import BasicTransform, Camera, RenderMesh
 from pyglGA.ECSS.System import System, TransformSystem, CameraSystem, RenderSystem
 import pyglGA.ECSS.ECSSManager
 
@@ -35,6 +35,7 @@ class TestECSSManager(unittest.TestCase):
         
         """
         self.WorldManager = pyglGA.ECSS.ECSSManager.ECSSManager()
+        self.WorldManager.reset() # start each test from an empty ECSS
         self.WorldManager2 = pyglGA.ECSS.ECSSManager.ECSSManager()
         
         """
@@ -98,7 +99,7 @@ class TestECSSManager(unittest.TestCase):
         print("TestECSSManager:test_init START".center(100, '-'))
         
         
-        for key, value in self.WorldManager._entities_components.items():
+        for key, value in self.WorldManager.entities_components.items():
             print("\n entity: ",key, ":: with components: ", value)
         
         self.assertEqual(id(self.WorldManager), id(self.WorldManager2))
@@ -121,6 +122,53 @@ class TestECSSManager(unittest.TestCase):
         print("TestECSSManager:test_init END".center(100, '-'))
     
     
+    def test_singleton(self):
+        """
+        ECSSManager() calls after the first one keep the existing ECSS
+        """
+        print("TestECSSManager:test_singleton START".center(100, '-'))
+        
+        dispatch = self.WorldManager._dispatch
+        nEntities = len(self.WorldManager.entities)
+        nComponents = len(self.WorldManager.components)
+        
+        worldManager3 = pyglGA.ECSS.ECSSManager.ECSSManager()
+        self.assertIs(worldManager3, self.WorldManager)
+        self.assertIs(worldManager3._dispatch, dispatch)
+        self.assertEqual(len(worldManager3.entities), nEntities)
+        self.assertEqual(len(worldManager3.components), nComponents)
+        self.assertIn(self.transUpdate, worldManager3.systems)
+        self.assertEqual(worldManager3.root, self.rootEntity)
+        
+        print("TestECSSManager:test_singleton END".center(100, '-'))
+    
+    
+    def test_reset(self):
+        """
+        ECSSManager reset() detaches the Entities and Components of the previous scene
+        """
+        print("TestECSSManager:test_reset START".center(100, '-'))
+        
+        self.WorldManager.reset()
+        self.assertEqual(len(self.WorldManager.entities), 0)
+        self.assertIsNone(self.rootEntity.row)
+        self.assertIsNone(self.rootEntity.worldManager)
+        self.assertIsNone(self.trans1.row)
+        np.testing.assert_array_equal(self.trans1.trs, util.translate(1.0,2.0,3.0))
+        self.assertIsNone(self.orthoCam.row)
+        np.testing.assert_array_equal(self.orthoCam.projMat, util.ortho(-100.0, 100.0, -100.0, 100.0, 1.0, 100.0))
+        
+        # an Entity of the previous scene is registered again instead of writing over a new one
+        newRoot = self.WorldManager.createEntity(Entity(name="root"))
+        mesh = self.WorldManager.addComponent(self.rootEntity, RenderMesh(name="m_old"))
+        self.assertEqual(newRoot.getNumberOfChildren(), 0)
+        self.assertEqual(self.rootEntity.row, 1)
+        self.assertIs(self.WorldManager.getComponent(self.rootEntity, RenderMesh), mesh)
+        self.assertIsNone(self.WorldManager.getComponent(newRoot, RenderMesh))
+        
+        print("TestECSSManager:test_reset END".center(100, '-'))
+    
+    
     def test_addComponent(self):
         """
         ECSSManager addComponent
@@ -141,10 +189,496 @@ class TestECSSManager(unittest.TestCase):
         self.assertNotIn(self.trans2, self.WorldManager._components)
         self.assertIsInstance(self.trans8, BasicTransform)
         
+        # trans8 reuses the TransformSoA row, trans2 keeps its own matrices
+        self.assertIsNone(self.trans2.row)
+        np.testing.assert_array_equal(self.trans2.trs, util.translate(2.0,3.0,4.0))
+        np.testing.assert_array_equal(self.trans8.trs, util.translate(20.0,30.0,40.0))
+        np.testing.assert_array_equal(self.WorldManager.transformSoA.trs_buf[self.trans8.row], self.trans8.trs)
+        
         self.WorldManager.print()
         
         print("TestECSSManager:test_addComponent END".center(100, '-'))
+    
+    def test_addComponentAgain(self):
+        """
+        ECSSManager addComponent of a component that is already bound
+        """
+        print("TestECSSManager:test_addComponentAgain START".center(100, '-'))
+        
+        # adding the same components again to their Entity leaves them as they are
+        self.assertIs(self.WorldManager.addComponent(self.entityCam2, self.orthoCam), self.orthoCam)
+        self.assertEqual(self.orthoCam.row, 0)
+        np.testing.assert_array_equal(self.orthoCam.projMat, util.ortho(-100.0, 100.0, -100.0, 100.0, 1.0, 100.0))
+        self.assertEqual(self.WorldManager.cameras, [self.orthoCam])
+        self.assertIs(self.WorldManager.addComponent(self.entityCam1, self.trans1), self.trans1)
+        self.WorldManager.addComponent(self.node4, self.trans4)
+        self.assertIn(self.trans4, self.WorldManager.components)
+        self.assertIn(self.trans1, self.WorldManager.components)
+        self.assertEqual(self.entityCam1.getNumberOfChildren(), 2)
+        
+        # a component added to another Entity is moved there, keeping its matrices
+        size = self.WorldManager.transformSoA.size
+        node8 = self.WorldManager.createEntity(Entity(name="node8"))
+        self.WorldManager.addComponent(node8, self.trans1)
+        np.testing.assert_array_equal(self.trans1.trs, util.translate(1.0,2.0,3.0))
+        self.assertIs(self.trans1.parent, node8)
+        self.assertNotIn(self.trans1, self.entityCam1._children)
+        self.assertEqual(self.entityCam1.getNumberOfChildren(), 1)
+        self.assertIsNone(self.WorldManager.getComponent(self.entityCam1, BasicTransform))
+        self.assertIs(self.WorldManager.getComponent(node8, BasicTransform), self.trans1)
+        self.assertEqual(self.WorldManager.transformSoA.size, size)
+        transOrder = list(self.WorldManager.transform_order)
+        self.assertEqual(sorted(transOrder), list(range(size)))
+        for trans in (self.trans2, self.trans3, self.trans4, self.trans5, self.trans6, self.trans7):
+            np.testing.assert_array_equal(self.WorldManager.transformSoA.trs_buf[trans.row], trans.trs)
+        
+        # the moved camera gets its CameraSoA row back
+        self.WorldManager.addComponent(node8, self.orthoCam)
+        self.assertEqual(self.orthoCam.row, 0)
+        self.assertEqual(self.WorldManager.cameras, [self.orthoCam])
+        self.assertEqual(list(self.WorldManager.camera_ids), [node8.row])
+        np.testing.assert_array_equal(self.orthoCam.projMat, util.ortho(-100.0, 100.0, -100.0, 100.0, 1.0, 100.0))
+        
+        print("TestECSSManager:test_addComponentAgain END".center(100, '-'))
+    
+    
+    def test_archetypes(self):
+        """
+        ECSSManager archetype tables
+        """
+        
+        print("TestECSSManager:test_archetypes START".center(100, '-'))
+        
+        transKey = frozenset({BasicTransform})
+        camKey = frozenset({BasicTransform, Camera})
+        self.assertIn(transKey, self.WorldManager.archetypes)
+        self.assertIn(camKey, self.WorldManager.archetypes)
+        
+        # entityCam2 is the only entity with both a BasicTransform and a Camera
+        camArchetype = self.WorldManager.archetypes[camKey]
+        self.assertEqual(len(camArchetype), 1)
+        self.assertIs(camArchetype.columns[BasicTransform][0], self.trans2)
+        self.assertIs(camArchetype.columns[Camera][0], self.orthoCam)
+        
+        transColumn = self.WorldManager.archetypes[transKey].columns[BasicTransform]
+        for trans in (self.trans1, self.trans3, self.trans4, self.trans5, self.trans6, self.trans7):
+            self.assertIn(trans, transColumn)
+        
+        # replacing a component keeps the entity in the same archetype row
+        self.trans8 = self.WorldManager.addComponent(self.entityCam2, BasicTransform(name="trans8"))
+        self.assertEqual(len(camArchetype), 1)
+        self.assertIs(camArchetype.columns[BasicTransform][0], self.trans8)
+        
+        self.assertEqual(self.WorldManager.entities_components[self.node4], [self.trans4])
+        self.assertIs(self.WorldManager.getComponent(self.entityCam2, Camera), self.orthoCam)
+        self.assertIsNone(self.WorldManager.getComponent(self.node4, Camera))
+        self.assertEqual(self.WorldManager.entities_components[self.rootEntity], [])
+        
+        print("TestECSSManager:test_archetypes END".center(100, '-'))
+        
+    def test_entity_ids(self):
+        """
+        ECSSManager dense entity and camera ids
+        """
+        
+        print("TestECSSManager:test_entity_ids START".center(100, '-'))
+        
+        self.assertEqual(list(self.WorldManager.entity_ids), list(range(8)))
+        for entity_id in self.WorldManager.entity_ids:
+            self.assertEqual(self.WorldManager.entities[entity_id].row, entity_id)
+        self.assertIs(self.WorldManager.entities[self.node7.row], self.node7)
+        
+        self.assertEqual(list(self.WorldManager.camera_ids), [self.entityCam2.row])
+        
+        print("TestECSSManager:test_entity_ids END".center(100, '-'))
+    
+    def test_child_count(self):
+        """
+        ECSSManager dense child count column
+        """
+        print("TestECSSManager:test_child_count START".center(100, '-'))
+        
+        self.assertEqual(self.WorldManager.child_count.dtype, np.int32)
+        self.assertEqual(len(self.WorldManager.child_count), len(self.WorldManager.entities))
+        for entity in self.WorldManager.entities:
+            self.assertEqual(entity.getNumberOfChildren(), len(entity._children))
+        self.assertEqual(self.rootEntity.getNumberOfChildren(), 3)
+        self.assertEqual(self.entityCam2.getNumberOfChildren(), 2)
+        self.assertEqual(self.trans7.getNumberOfChildren(), 0)
+        self.assertEqual(self.orthoCam.getNumberOfChildren(), 0)
+        
+        # replacing a component keeps the count
+        self.WorldManager.addComponent(self.node4, BasicTransform(name="trans4b"))
+        self.assertEqual(self.node4.getNumberOfChildren(), 1)
+        self.WorldManager.addComponent(self.node4, RenderMesh(name="mesh4"))
+        self.assertEqual(self.node4.getNumberOfChildren(), 2)
+        
+        # children added or removed directly in the scenegraph are counted too
+        mesh7 = RenderMesh(name="mesh7")
+        self.node7.add(mesh7)
+        self.assertEqual(self.node7.getNumberOfChildren(), len(self.node7._children))
+        self.node7.remove(mesh7)
+        self.assertEqual(self.node7.getNumberOfChildren(), len(self.node7._children))
+        
+        print("TestECSSManager:test_child_count END".center(100, '-'))
+    
+    
+    def test_transformSoA(self):
+        """
+        ECSSManager TransformSoA buffers
+        """
+        
+        print("TestECSSManager:test_transformSoA START".center(100, '-'))
+        
+        soa = self.WorldManager.transformSoA
+        self.assertEqual(soa.size, 7)
+        np.testing.assert_array_equal(soa.trs_buf[self.trans7.row], util.translate(7.0,7.0,7.0))
+        
+        # properties are views in the buffers
+        self.trans4.trs = util.translate(4.0,4.0,4.0)
+        np.testing.assert_array_equal(soa.trs_buf[self.trans4.row], util.translate(4.0,4.0,4.0))
+        
+        print("TestECSSManager:test_transformSoA END".center(100, '-'))
+    
+    def test_cameraSoA(self):
+        """
+        ECSSManager CameraSoA and batched updateCameras()
+        """
+        print("TestECSSManager:test_cameraSoA START".center(100, '-'))
+        
+        camOrthoMat = util.ortho(-100.0, 100.0, -100.0, 100.0, 1.0, 100.0)
+        soa = self.WorldManager.cameraSoA
+        self.assertEqual(soa.size, 1)
+        self.assertEqual(self.orthoCam.row, 0)
+        np.testing.assert_array_equal(soa.proj_buf[0], camOrthoMat)
+        self.assertTrue(np.shares_memory(self.orthoCam.projMat, soa.proj_buf))
+        
+        self.WorldManager.traverse_visit(self.transUpdate, self.rootEntity)
+        self.WorldManager.updateCameras()
+        trans2l2w = util.translate(2.0,3.0,4.0) @ util.translate(1.0,2.0,3.0)
+        np.testing.assert_array_almost_equal(self.orthoCam.root2cam, util.inverse(trans2l2w) @ camOrthoMat)
+        
+        # a second camera, on an entity without BasicTransform
+        node8 = self.WorldManager.createEntity(Entity(name="node8"))
+        self.WorldManager.addEntityChild(self.rootEntity, node8)
+        cam2 = self.WorldManager.addComponent(node8, Camera(util.scale(2.0), "cam2", "Camera", "501"))
+        self.assertEqual(cam2.row, 1)
+        self.WorldManager.updateCameras()
+        np.testing.assert_array_equal(cam2.root2cam, util.identity())
+        
+        # replacing the first camera moves the last one in its row, the new camera is appended
+        cam3 = self.WorldManager.addComponent(self.entityCam2, Camera(util.scale(3.0), "cam3", "Camera", "502"))
+        self.assertIsNone(self.orthoCam.row)
+        np.testing.assert_array_equal(self.orthoCam.projMat, camOrthoMat)
+        self.assertEqual(cam2.row, 0)
+        self.assertEqual(cam3.row, 1)
+        self.assertEqual(self.WorldManager.cameras, [cam2, cam3])
+        self.assertEqual(list(self.WorldManager.camera_ids), [node8.row, self.entityCam2.row])
+        np.testing.assert_array_equal(cam3.projMat, util.scale(3.0))
+        np.testing.assert_array_equal(cam2.projMat, util.scale(2.0))
+        
+        print("TestECSSManager:test_cameraSoA END".center(100, '-'))
+    
+    def test_cameraSystemCameras(self):
+        """
+        CameraSystem calculates the root2cam of all cameras once per frame 
+        and falls back to the first ECSSManager camera
+        """
+        print("TestECSSManager:test_cameraSystemCameras START".center(100, '-'))
+        
+        updates = []
+        updateCameras = self.WorldManager.updateCameras
+        def countUpdates():
+            updates.append(1)
+            updateCameras()
+        self.WorldManager.updateCameras = countUpdates
+        try:
+            node8 = self.WorldManager.createEntity(Entity(name="node8"))
+            self.WorldManager.addEntityChild(self.rootEntity, node8)
+            cam2 = self.WorldManager.addComponent(node8, Camera(util.scale(2.0), "cam2", "Camera", "501"))
+            
+            self.WorldManager.traverse_visit(self.transUpdate, self.rootEntity)
+            camUpdate = CameraSystem("camUpdate", "CameraUpdate", "300")
+            for cam in self.WorldManager.cameras:
+                self.WorldManager.traverse_visit_pre_camera(camUpdate, cam)
+                self.WorldManager.traverse_visit(camUpdate, self.rootEntity)
+            self.assertEqual(len(updates), 1)
+            np.testing.assert_array_almost_equal(self.trans7.l2cam, self.trans7.l2world @ cam2.root2cam)
+            
+            # a new frame calculates them again
+            self.WorldManager.traverse_visit(self.transUpdate, self.rootEntity)
+            self.WorldManager.traverse_visit_pre_camera(camUpdate, self.orthoCam)
+            self.assertEqual(len(updates), 2)
+        finally:
+            del self.WorldManager.updateCameras
+        
+        # without a given or visited camera, the first camera of the ECSSManager is used
+        camUpdate = CameraSystem("camUpdate", "CameraUpdate", "301")
+        self.WorldManager.traverse_visit(camUpdate, self.rootEntity)
+        np.testing.assert_array_almost_equal(self.trans7.l2cam, self.trans7.l2world @ self.orthoCam.root2cam)
+        camUpdate = CameraSystem("camUpdate", "CameraUpdate", "302")
+        self.WorldManager.traverse_visit(camUpdate, self.node3)
+        np.testing.assert_array_almost_equal(self.trans7.l2cam, self.trans7.l2world @ self.orthoCam.root2cam)
+        
+        # without any camera it is an error
+        self.WorldManager.reset()
+        with self.assertRaises(RuntimeError):
+            CameraSystem("camUpdate", "CameraUpdate", "303").applyCamera2BasicTransform(BasicTransform())
+        
+        print("TestECSSManager:test_cameraSystemCameras END".center(100, '-'))
+    
+    
+    def test_rebuildTraversal(self):
+        """
+        ECSSManager flattened scenegraph
+        """
+        
+        print("TestECSSManager:test_rebuildTraversal START".center(100, '-'))
+        
+        self.WorldManager.rebuildTraversal()
+        entities = [self.rootEntity, self.entityCam1, self.entityCam2, self.node4, 
+                    self.node3, self.node5, self.node6, self.node7]
+        self.assertEqual(list(self.WorldManager.dfs_order), [entity.row for entity in entities])
+        self.assertEqual(list(self.WorldManager.parent_row), [-1, 0, 1, 0, 0, 4, 4, 6])
+        
+        trans = [self.trans1, self.trans2, self.trans4, self.trans3, self.trans5, self.trans6, self.trans7]
+        self.assertEqual(list(self.WorldManager.transform_order), [tr.row for tr in trans])
+        parentTrans = [None, self.trans1, None, None, self.trans3, self.trans3, self.trans6]
+        self.assertEqual(list(self.WorldManager.transform_parent), [-1 if tr is None else tr.row for tr in parentTrans])
+        
+        # a hierarchy change rebuilds the arrays on their next access
+        node8 = self.WorldManager.createEntity(Entity(name="node8"))
+        self.WorldManager.addEntityChild(self.node7, node8)
+        self.assertEqual(self.WorldManager.dfs_order[-1], node8.row)
+        self.assertEqual(self.WorldManager.parent_row[-1], 7)
+        
+        # so does a hierarchy built directly at scenegraph level, after a first traversal
+        node9 = self.WorldManager.createEntity(Entity(name="node9"))
+        trans9 = self.WorldManager.addComponent(node9, BasicTransform(name="trans9", trs=util.translate(9.0,9.0,9.0)))
+        self.WorldManager.traverse_visit(self.transUpdate, self.rootEntity)
+        self.entityCam1.add(node9)
+        self.WorldManager.traverse_visit(self.transUpdate, self.rootEntity)
+        np.testing.assert_array_almost_equal(trans9.l2world, trans9.trs @ self.trans1.l2world)
+        # node9 is then a second root, outside of the root's subtree
+        self.entityCam1.remove(node9)
+        self.assertFalse(self.WorldManager.fully_managed)
+        
+        print("TestECSSManager:test_rebuildTraversal END".center(100, '-'))
+    
+    def test_bind(self):
+        """
+        ECSSManager bind
+        """
+        
+        print("TestECSSManager:test_bind START".center(100, '-'))
+        
+        # BasicTransforms live in the {BasicTransform} and {BasicTransform, Camera} archetypes
+        cachedColumns = self.WorldManager.bind(self.transUpdate)
+        self.assertIs(self.transUpdate.cachedColumns, cachedColumns)
+        self.assertEqual(len(cachedColumns), 2)
+        boundTrans = [comp for columns in cachedColumns for comp in columns[0]]
+        self.assertEqual(len(boundTrans), 7)
+        self.assertIn(self.trans2, boundTrans)
+        
+        # a new archetype invalidates the cached columns of all systems
+        self.assertEqual(self.transUpdate.cachedGeneration, self.WorldManager.archetype_generation)
+        self.WorldManager.addComponent(self.node4, RenderMesh(name="mesh4"))
+        self.assertNotEqual(self.transUpdate.cachedGeneration, self.WorldManager.archetype_generation)
+        self.assertEqual(len(self.WorldManager.bind(self.transUpdate)), 3)
+        
+        # also for systems that were not created in the ECSSManager
+        class MeshSystem(System):
+            def __init__(self):
+                super().__init__("meshSystem")
+                self._requiredTypes = (RenderMesh,)
+                self.visited = []
+            def apply2Components(self, renderMesh):
+                self.visited.append(renderMesh)
+        meshSystem = MeshSystem()
+        self.WorldManager.traverse_visit(meshSystem, self.rootEntity)
+        self.assertEqual([mesh.name for mesh in meshSystem.visited], ["mesh4"])
+        self.WorldManager.addComponent(self.entityCam2, RenderMesh(name="mesh2"))
+        meshSystem.visited = []
+        self.WorldManager.traverse_visit(meshSystem, self.rootEntity)
+        self.assertEqual(sorted(mesh.name for mesh in meshSystem.visited), ["mesh2", "mesh4"])
+        
+        print("TestECSSManager:test_bind END".center(100, '-'))
+    
+    def test_traverse_visit_subtree(self):
+        """
+        ECSSManager traverse_visit of Systems with requiredTypes on a subtree or a partly unmanaged scenegraph
+        """
+        print("TestECSSManager:test_traverse_visit_subtree START".center(100, '-'))
+        
+        class RecordTransformSystem(TransformSystem):
+            def apply2BasicTransform(self, basicTransform):
+                self.visited.append(basicTransform.name)
+        recordUpdate = RecordTransformSystem("recordUpdate", "TransformUpdate", "203")
+        recordUpdate.visited = []
+        
+        self.assertTrue(self.WorldManager.fully_managed)
+        self.WorldManager.traverse_visit(recordUpdate, self.node3)
+        self.assertEqual(recordUpdate.visited, ["trans3", "trans5", "trans6", "trans7"])
+        
+        # a BasicTransform added directly in the scenegraph is visited too
+        trans8 = BasicTransform(name="trans8", trs=util.translate(8.0,8.0,8.0))
+        self.node7.add(trans8)
+        self.assertFalse(self.WorldManager.fully_managed)
+        recordUpdate.visited = []
+        self.WorldManager.traverse_visit(recordUpdate, self.rootEntity)
+        self.assertEqual(recordUpdate.visited, ["trans1", "trans2", "trans4", "trans3", "trans5", "trans6", "trans7", "trans8"])
+        self.node7.remove(trans8)
+        self.assertTrue(self.WorldManager.fully_managed)
+        
+        print("TestECSSManager:test_traverse_visit_subtree END".center(100, '-'))
+    
+    
+    def test_dispatch(self):
+        """
+        ECSSManager dispatch table
+        """
         
+        print("TestECSSManager:test_dispatch START".center(100, '-'))
+        
+        self.assertIs(self.WorldManager.getDispatch(BasicTransform, TransformSystem), TransformSystem.apply2BasicTransform)
+        self.assertIs(self.WorldManager.getDispatch(Camera, CameraSystem), CameraSystem.apply2Camera)
+        self.assertIsNone(self.WorldManager.getDispatch(Camera, TransformSystem))
+        
+        # subclasses of a System use their own override of the registered method
+        class MyTransformSystem(TransformSystem):
+            def apply2BasicTransform(self, basicTransform):
+                basicTransform.name = "visited"
+        self.assertIs(self.WorldManager.getDispatch(BasicTransform, MyTransformSystem), MyTransformSystem.apply2BasicTransform)
+        
+        # their traversal calls the override instead of the batched update
+        self.WorldManager.traverse_visit(MyTransformSystem("myTransUpdate", "TransformUpdate", "201"), self.rootEntity)
+        self.assertEqual(self.trans7.name, "visited")
+        
+        class MyCameraSystem(CameraSystem):
+            def applyCamera2BasicTransform(self, basicTransform):
+                basicTransform.name = "camera visited"
+        self.WorldManager.traverse_visit(MyCameraSystem("myCamUpdate", "CameraUpdate", "202"), self.rootEntity)
+        self.assertEqual(self.trans7.name, "camera visited")
+        
+        class MeshSystem(System):
+            def apply2MyMesh(self, renderMesh):
+                renderMesh.name = "visited"
+        self.WorldManager.registerDispatch(RenderMesh, MeshSystem, MeshSystem.apply2MyMesh)
+        mesh4 = self.WorldManager.addComponent(self.node4, RenderMesh(name="mesh4"))
+        self.WorldManager.traverse_visit(MeshSystem(), self.rootEntity)
+        self.assertEqual(mesh4.name, "visited")
+        
+        # callables that are not methods of the System are used as registered by its subclasses
+        class LambdaSystem(System):
+            pass
+        class MyLambdaSystem(LambdaSystem):
+            pass
+        visit = lambda system, renderMesh: setattr(renderMesh, "name", "lambda visited")
+        self.WorldManager.registerDispatch(RenderMesh, LambdaSystem, visit)
+        self.assertIs(self.WorldManager.getDispatch(RenderMesh, MyLambdaSystem), visit)
+        self.WorldManager.traverse_visit(MyLambdaSystem(), self.rootEntity)
+        self.assertEqual(mesh4.name, "lambda visited")
+        
+        print("TestECSSManager:test_dispatch END".center(100, '-'))
+    
+    def test_commandBuffer(self):
+        """
+        RenderSystem emits RenderMesh draw commands in the ECSSManager CommandBuffer and flushes them per material
+        """
+        print("TestECSSManager:test_commandBuffer START".center(100, '-'))
+        
+        mesh4 = self.WorldManager.addComponent(self.node4, RenderMesh(name="mesh4", vertex_index=[0,1,2,2,1,3], vao_id=2, material_id=1))
+        mesh5 = self.WorldManager.addComponent(self.node5, RenderMesh(name="mesh5", vertex_attributes=[[[0,0,0],[1,0,0],[0,1,0]]], vao_id=1, material_id=1))
+        mesh6 = self.WorldManager.addComponent(self.node6, RenderMesh(name="mesh6", vertex_index=[0,1,2], vao_id=3, material_id=0))
+        
+        batches = []
+        class MyRenderSystem(RenderSystem):
+            def drawBatch(self, material_id, commands, worldManager):
+                batches.append((material_id, commands.copy()))
+        renderUpdate = self.WorldManager.createSystem(MyRenderSystem("renderUpdate", "RenderUpdate", "300"))
+        
+        self.WorldManager.traverse_visit(renderUpdate, self.rootEntity)
+        self.assertEqual(self.WorldManager.commandBuffer.size, 3)
+        self.assertEqual(renderUpdate.flush(self.WorldManager), 2)
+        self.assertEqual(self.WorldManager.commandBuffer.size, 0)
+        
+        self.assertEqual([material_id for material_id, _ in batches], [0, 1])
+        self.assertEqual(list(batches[0][1]['vao_id']), [3])
+        self.assertEqual(list(batches[1][1]['vao_id']), [1, 2])
+        self.assertEqual(list(batches[1][1]['index_count']), [3, 6])
+        self.assertEqual(list(batches[1][1]['instance_id']), [self.trans5.row, self.trans4.row])
+        
+        # RenderSystems that never flush() do not grow the CommandBuffer across traversals
+        unflushed = RenderSystem("renderNoFlush", "RenderUpdate", "301")
+        self.WorldManager.traverse_visit(unflushed, self.rootEntity)
+        self.WorldManager.traverse_visit(unflushed, self.rootEntity)
+        self.assertEqual(self.WorldManager.commandBuffer.size, 3)
+        
+        print("TestECSSManager:test_commandBuffer END".center(100, '-'))
+    
+    
+    def test_pools(self):
+        """
+        ECSSManager keeps Components in the list registered for their type
+        """
+        print("TestECSSManager:test_pools START".center(100, '-'))
+        
+        self.assertIn(self.orthoCam, self.WorldManager.cameras)
+        self.assertNotIn(self.orthoCam, self.WorldManager.components)
+        self.assertIn(self.trans4, self.WorldManager.components)
+        
+        # subclasses use the list of their base class
+        class MyCamera(Camera):
+            pass
+        myCam = self.WorldManager.addComponent(self.node4, MyCamera(util.scale(2.0), "myCam"))
+        self.assertIn(myCam, self.WorldManager.cameras)
+        self.assertEqual(myCam.row, 1)
+        
+        # new Component types register their own list
+        class Light(RenderMesh):
+            pass
+        lights = []
+        self.WorldManager.registerPool(Light, 
+                                       lambda worldManager, entity, light: lights.append(light), 
+                                       lambda worldManager, light: lights.remove(light))
+        light = self.WorldManager.addComponent(self.node3, Light(name="light"))
+        self.assertEqual(lights, [light])
+        self.assertNotIn(light, self.WorldManager.components)
+        light2 = self.WorldManager.addComponent(self.node3, Light(name="light2"))
+        self.assertEqual(lights, [light2])
+        
+        # components added before their type, or a base type, is registered move to its list
+        class SpotLight(RenderMesh):
+            pass
+        spotLight = self.WorldManager.addComponent(self.node4, SpotLight(name="spotLight"))
+        self.assertIn(spotLight, self.WorldManager.components)
+        spotLights = []
+        self.WorldManager.registerPool(SpotLight, 
+                                       lambda worldManager, entity, light: spotLights.append(light), 
+                                       lambda worldManager, light: spotLights.remove(light))
+        self.assertEqual(spotLights, [spotLight])
+        self.assertNotIn(spotLight, self.WorldManager.components)
+        spotLight2 = self.WorldManager.addComponent(self.node4, SpotLight(name="spotLight2"))
+        self.assertEqual(spotLights, [spotLight2])
+        
+        class BrightLight(Light):
+            pass
+        self.assertEqual(self.WorldManager.getPool(BrightLight), self.WorldManager.getPool(Light))
+        
+        # components move from whatever list they were kept in before, e.g. the cameras
+        myCams = []
+        self.WorldManager.registerPool(MyCamera, 
+                                       lambda worldManager, entity, cam: myCams.append(cam), 
+                                       lambda worldManager, cam: myCams.remove(cam))
+        self.assertEqual(myCams, [myCam])
+        self.assertNotIn(myCam, self.WorldManager.cameras)
+        self.assertIn(self.orthoCam, self.WorldManager.cameras)
+        self.assertIsNone(myCam.row)
+        self.assertEqual(self.orthoCam.row, 0)
+        
+        print("TestECSSManager:test_pools END".center(100, '-'))
+    
+    
     def test_traverse_visit(self):
         """
         ECSSManager traverse_visit
@@ -91,6 +91,26 @@ class TestEntity(unittest.TestCase):
         self.assertNotEqual(gameObject2, gameObject2.parent)
         #print("gameObject._children[0]" + gameObject._children[0])
         print("TestEntity:test_getChildParent() END")
+    
+    def test_weakParent(self):
+        """
+        Entity test_weakParent() test, children do not keep their parent alive
+        """
+        print("TestEntity:test_weakParent() START")
+        gameObject = Entity()
+        gameComponent = BasicTransform()
+        self.assertIs(gameComponent.parent, gameComponent)
+        self.assertIsNone(gameObject.parent)
+        
+        gameObject.add(gameComponent)
+        self.assertIs(gameComponent.parent, gameObject)
+        gameObject.remove(gameComponent)
+        self.assertIsNone(gameComponent.parent)
+        
+        gameObject.add(gameComponent)
+        del gameObject
+        self.assertIsNone(gameComponent.parent)
+        print("TestEntity:test_weakParent() END")
         
     def test_getNumberOfChildren(self):
         """
@@ -107,6 +127,10 @@ class TestEntity(unittest.TestCase):
         self.assertIn(gameObject1, gameObject._children)
         print(f"test_getNumberOfChildren() scene: \n {gameObject.update()}")
         self.assertEqual(gameObject.getNumberOfChildren(), 1)
+        # leaf Components have no children list
+        gameComponent = RenderMesh(name="mesh3")
+        gameObject3.add(gameComponent)
+        self.assertEqual(gameComponent.getNumberOfChildren(), 0)
         #print("gameObject._children[0]" + gameObject._children[0])
         print("TestEntity:test_getNumberOfChildren() END")
     
@@ -285,6 +309,53 @@ class TestBasicTransform(unittest.TestCase):
         print("TestBasicTransform:test_init() END") 
     
     
+    @unittest.skipUnless(__debug__, "debug logging is compiled out under -O")
+    def test_updateLog(self):
+        """
+        BasicTransform update() logs at debug level instead of printing
+        """
+        print("TestBasicTransform:test_updateLog() START")
+        trans = BasicTransform(name="trans")
+        with self.assertLogs("pyglGA.ECSS.Component", level="DEBUG") as logs:
+            trans.update(trs=util.translate(1.0,2.0,3.0))
+        self.assertIn("BasicTransform: update() called", logs.output[0])
+        np.testing.assert_array_equal(trans.trs, util.translate(1.0,2.0,3.0))
+        print("TestBasicTransform:test_updateLog() END")
+    
+    
+    def test_slots(self):
+        #components store their attributes in __slots__ and not in a __dict__
+        print("\nTestBasicTransform:test_slots() START")
+        
+        for comp in (BasicTransform(), Camera(), RenderMesh(), Entity()):
+            self.assertFalse(hasattr(comp, "__dict__"))
+        
+        myTrans = BasicTransform("myTrans")
+        with self.assertRaises(AttributeError):
+            myTrans.undeclared = 1
+        
+        # only Entities store a children list, leaf Components share the class level None
+        for comp in (BasicTransform(), Camera(), RenderMesh()):
+            self.assertIsNone(comp._children)
+            self.assertIs(comp.parent, comp)
+            self.assertEqual(comp.getNumberOfChildren(), 0)
+        self.assertNotIn("_children", Component.__slots__)
+        self.assertEqual(Entity()._children, [])
+        
+        print("\nTestBasicTransform:test_slots() END")
+    
+    def test_internedNames(self):
+        #names and types built at runtime are interned
+        print("\nTestBasicTransform:test_internedNames() START")
+        
+        myTrans = BasicTransform(name="".join(["wa", "ll"]), type="".join(["T", "RS"]))
+        self.assertIs(myTrans.name, "wall")
+        self.assertIs(myTrans.type, "TRS")
+        myTrans.name = "".join(["flo", "or"])
+        self.assertIs(myTrans.name, "floor")
+        
+        print("\nTestBasicTransform:test_internedNames() END")
+    
     def test_BasicTransform_compNullIterator(self):
         #test null iterator
         print("\nTestBasicTransform:test_BasicTransform_compNullIterator() START")
@@ -293,7 +364,9 @@ class TestBasicTransform(unittest.TestCase):
         myIter = iter(myTrans)
         
         self.assertIsInstance(myIter, CompNullIterator)
-        self.assertEqual(next(myIter), None)
+        with self.assertRaises(StopIteration):
+            next(myIter)
+        self.assertIs(myIter, iter(myTrans))
         
         print(myTrans)
         print("\nTestBasicTransform:test_BasicTransform_compNullIterator() END")
@@ -324,7 +397,9 @@ class TestRenderMesh(unittest.TestCase):
         myIter = iter(myMesh)
         
         self.assertIsInstance(myIter, CompNullIterator)
-        self.assertEqual(next(myIter), None)
+        with self.assertRaises(StopIteration):
+            next(myIter)
+        self.assertIs(myIter, iter(myMesh))
         
         print(myMesh)
         print("\nTestRenderMesh:test_RenderMesh_compNullIterator() END")
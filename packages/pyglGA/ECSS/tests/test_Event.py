@@ -49,6 +49,7 @@ class TestEvent(unittest.TestCase):
         """
         
         self.scene = Scene()    
+        self.scene.world.reset() # start each test from an empty ECSS
         
         # Scenegraph with Entities, Components
         self.rootEntity = self.scene.world.createEntity(Entity(name="Root"))
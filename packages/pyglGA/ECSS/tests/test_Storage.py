@@ -0,0 +1,189 @@
+"""
+Test Storage Unit tests, part of the glGA SDK ECSS
+    
+glGA SDK v2021.0.5 ECSS (Entity Component System in a Scenegraph)
+@Coopyright 2020-2021 George Papagiannakis
+
+"""
+
+import unittest
+import numpy as np
+
+import pyglGA.ECSS.utilities as util
+from pyglGA.ECSS.Component import BasicTransform, Camera
+from pyglGA.ECSS.Storage import Archetype, TransformSoA, CameraSoA, CommandBuffer, cmd_dtype
+
+
+class TestArchetype(unittest.TestCase):
+    
+    def test_init(self):
+        """
+        Archetype init() test
+        """
+        print("TestArchetype:test_init() START")
+        
+        archetype = Archetype(frozenset({BasicTransform, Camera}))
+        
+        self.assertEqual(archetype.component_types, frozenset({BasicTransform, Camera}))
+        self.assertEqual(set(archetype.columns), {BasicTransform, Camera})
+        self.assertEqual(len(archetype), 0)
+        
+        print("TestArchetype:test_init() END")
+    
+    def test_addRow(self):
+        """
+        Archetype addRow() test
+        """
+        print("TestArchetype:test_addRow() START")
+        
+        archetype = Archetype(frozenset({BasicTransform}))
+        trans1 = BasicTransform(name="trans1")
+        trans2 = BasicTransform(name="trans2")
+        
+        self.assertEqual(archetype.addRow(10, {BasicTransform: trans1}), 0)
+        self.assertEqual(archetype.addRow(20, {BasicTransform: trans2}), 1)
+        self.assertEqual(archetype.columns[BasicTransform], [trans1, trans2])
+        self.assertEqual(archetype.entity_ids, [10, 20])
+        self.assertEqual(archetype.getRow(1), {BasicTransform: trans2})
+        
+        print("TestArchetype:test_addRow() END")
+    
+    def test_removeRow(self):
+        """
+        Archetype removeRow() test, the last row is moved in the removed one
+        """
+        print("TestArchetype:test_removeRow() START")
+        
+        archetype = Archetype(frozenset({BasicTransform}))
+        trans = [BasicTransform(name=f"trans{i}") for i in range(3)]
+        for i, tr in enumerate(trans):
+            archetype.addRow(i, {BasicTransform: tr})
+        
+        moved_id, components = archetype.removeRow(0)
+        self.assertEqual(moved_id, 2)
+        self.assertIs(components[BasicTransform], trans[0])
+        self.assertEqual(archetype.columns[BasicTransform], [trans[2], trans[1]])
+        self.assertEqual(archetype.entity_ids, [2, 1])
+        
+        # removing the last row does not move any other row
+        moved_id, components = archetype.removeRow(1)
+        self.assertIsNone(moved_id)
+        self.assertIs(components[BasicTransform], trans[1])
+        self.assertEqual(archetype.entity_ids, [2])
+        
+        print("TestArchetype:test_removeRow() END")
+
+
+
+class TestTransformSoA(unittest.TestCase):
+    
+    def test_addRow(self):
+        """
+        TransformSoA addRow() test, the buffers grow when they are full
+        """
+        print("TestTransformSoA:test_addRow() START")
+        
+        soa = TransformSoA(capacity=2)
+        self.assertEqual(soa.addRow(trs=util.translate(1.0,2.0,3.0)), 0)
+        self.assertEqual(soa.addRow(), 1)
+        self.assertEqual(soa.addRow(l2world=util.scale(2.0)), 2)
+        
+        self.assertEqual(soa.size, 3)
+        self.assertEqual(soa.capacity, 4)
+        self.assertEqual(soa.trs_buf.shape, (4,4,4))
+        np.testing.assert_array_equal(soa.trs_buf[0], util.translate(1.0,2.0,3.0))
+        np.testing.assert_array_equal(soa.l2w_buf[2], util.scale(2.0))
+        np.testing.assert_array_equal(soa.l2c_buf[3], util.identity())
+        
+        print("TestTransformSoA:test_addRow() END")
+    
+    def test_removeRow(self):
+        """
+        TransformSoA removeRow() test, the last row is moved in the removed one
+        """
+        print("TestTransformSoA:test_removeRow() START")
+        
+        soa = TransformSoA()
+        soa.addRow(trs=util.translate(1.0,2.0,3.0))
+        soa.addRow(trs=util.scale(2.0))
+        self.assertEqual(soa.removeRow(0), 1)
+        self.assertEqual(soa.size, 1)
+        np.testing.assert_array_equal(soa.trs_buf[0], util.scale(2.0))
+        np.testing.assert_array_equal(soa.trs_buf[1], util.identity())
+        self.assertIsNone(soa.removeRow(0))
+        
+        print("TestTransformSoA:test_removeRow() END")
+
+
+
+class TestCameraSoA(unittest.TestCase):
+    
+    def test_removeRow(self):
+        """
+        CameraSoA removeRow() test, the last row is moved in the removed one
+        """
+        print("TestCameraSoA:test_removeRow() START")
+        
+        soa = CameraSoA(capacity=1)
+        soa.addRow(proj=util.scale(1.0))
+        soa.addRow(proj=util.scale(2.0))
+        soa.addRow(proj=util.scale(3.0), view=util.translate(1.0,2.0,3.0))
+        self.assertEqual(soa.capacity, 4)
+        
+        self.assertEqual(soa.removeRow(0), 2)
+        self.assertEqual(soa.size, 2)
+        np.testing.assert_array_equal(soa.proj_buf[0], util.scale(3.0))
+        np.testing.assert_array_equal(soa.view_buf[0], util.translate(1.0,2.0,3.0))
+        np.testing.assert_array_equal(soa.proj_buf[2], util.identity())
+        self.assertIsNone(soa.removeRow(1))
+        self.assertEqual(soa.size, 1)
+        
+        print("TestCameraSoA:test_removeRow() END")
+    
+    def test_updateViewProjection(self):
+        """
+        CameraSoA updateViewProjection() test, vp = view @ proj for all rows
+        """
+        print("TestCameraSoA:test_updateViewProjection() START")
+        
+        soa = CameraSoA()
+        proj = util.ortho(-100.0, 100.0, -100.0, 100.0, 1.0, 100.0)
+        soa.addRow(proj=proj, view=util.translate(1.0,2.0,3.0))
+        soa.addRow(proj=proj)
+        soa.updateViewProjection()
+        
+        np.testing.assert_array_almost_equal(soa.vp_buf[0], util.translate(1.0,2.0,3.0) @ proj)
+        np.testing.assert_array_almost_equal(soa.vp_buf[1], proj)
+        
+        print("TestCameraSoA:test_updateViewProjection() END")
+
+
+class TestCommandBuffer(unittest.TestCase):
+    
+    def test_batches(self):
+        """
+        CommandBuffer sort() and batches() test, one batch per material sorted by vertex array
+        """
+        print("TestCommandBuffer:test_batches() START")
+        
+        cmdbuf = CommandBuffer(capacity=2)
+        cmdbuf.append(vao_id=4, index_count=36, instance_id=0, material_id=2)
+        cmdbuf.append(vao_id=1, index_count=6, instance_id=1, material_id=0)
+        cmdbuf.append(vao_id=3, index_count=3, instance_id=2, material_id=2)
+        self.assertEqual(cmdbuf.size, 3)
+        self.assertEqual(cmdbuf.capacity, 4)
+        self.assertEqual(cmdbuf.commands.dtype, cmd_dtype)
+        
+        cmdbuf.sort()
+        batches = list(cmdbuf.batches())
+        self.assertEqual([material_id for material_id, _ in batches], [0, 2])
+        self.assertEqual(list(batches[1][1]['vao_id']), [3, 4])
+        self.assertEqual(list(batches[1][1]['instance_id']), [2, 0])
+        
+        cmdbuf.clear()
+        self.assertEqual(list(cmdbuf.batches()), [])
+        
+        print("TestCommandBuffer:test_batches() END")
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], verbosity=3, exit=False)
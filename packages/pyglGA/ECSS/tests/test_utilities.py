@@ -435,6 +435,26 @@ class TestUtilities(unittest.TestCase):
         np.testing.assert_array_almost_equal(rot_ab_glm_slerp.as_quat(),quat_slerp)
     
         print("TestUtilities:test_quaternion() END")
+    
+    def test_update_world(self):
+        """
+        test_update_world function on a flattened 3 level hierarchy
+        """
+        print("\nTestUtilities:test_update_world() START")
+        trs = np.array([translate(1.0,2.0,3.0), rotate((0.0,0.0,1.0), 90.0), scale(2.0), translate(4.0,5.0,6.0)])
+        l2w = np.zeros((4,4,4))
+        # hierarchy: row 3 -> row 1 -> row 0, and row 2 is a root
+        order = np.array([0, 1, 3, 2], dtype=np.int32)
+        parent = np.array([-1, 0, 1, -1], dtype=np.int32)
+        
+        update_world(trs, l2w, order, parent)
+        
+        np.testing.assert_array_almost_equal(l2w[0], trs[0])
+        np.testing.assert_array_almost_equal(l2w[1], trs[1] @ trs[0])
+        np.testing.assert_array_almost_equal(l2w[3], trs[3] @ trs[1] @ trs[0])
+        np.testing.assert_array_almost_equal(l2w[2], trs[2])
+        
+        print("TestUtilities:test_update_world() END")
         
 
 if __name__ == "__main__":
@@ -19,6 +19,14 @@ from numpy.linalg import inv
 # Python external modules
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError: # without numba the kernels below run as plain python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
 # vector, points related functions -----------------------------------------------
 def vec(*iterable):
     """
@@ -424,4 +432,42 @@ def quaternion_slerp(q0, q1, fraction):
     theta = theta_0 * fraction                # angle between q0 and result
     q2 = normalise(q1 - q0*dot)              # {q0, q2} now orthonormal basis
 
-    return   q0*math.cos(theta) + q2*math.sin(theta)
\ No newline at end of file
+    return   q0*math.cos(theta) + q2*math.sin(theta)
+
+
+# ------------ batched kernels over contiguous (N,4,4) matrix buffers --------------
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def update_world(trs, l2w, order, parent):
+    """calculate the local2world matrices of a flattened scenegraph: l2w[i] = trs[i] @ l2w[parent]
+
+    The 4x4 matrix product is unrolled on the 16 parent elements, so that the compiled kernel
+    is vectorised with fused multiply-adds.
+
+    :param trs: (N,4,4) buffer of trs matrices
+    :type trs: numpy.ndarray
+    :param l2w: (N,4,4) buffer of local2world matrices, updated in place
+    :type l2w: numpy.ndarray
+    :param order: rows of the buffers in scenegraph pre-order, so that parents come before their children
+    :type order: numpy.ndarray
+    :param parent: per position in order, the row of the parent matrix, -1 if there is none
+    :type parent: numpy.ndarray
+    """
+    for k in range(order.shape[0]):
+        i = order[k]
+        p = parent[k]
+        if p < 0:
+            for r in range(4):
+                for c in range(4):
+                    l2w[i, r, c] = trs[i, r, c]
+            continue
+        b00 = l2w[p, 0, 0]; b01 = l2w[p, 0, 1]; b02 = l2w[p, 0, 2]; b03 = l2w[p, 0, 3]
+        b10 = l2w[p, 1, 0]; b11 = l2w[p, 1, 1]; b12 = l2w[p, 1, 2]; b13 = l2w[p, 1, 3]
+        b20 = l2w[p, 2, 0]; b21 = l2w[p, 2, 1]; b22 = l2w[p, 2, 2]; b23 = l2w[p, 2, 3]
+        b30 = l2w[p, 3, 0]; b31 = l2w[p, 3, 1]; b32 = l2w[p, 3, 2]; b33 = l2w[p, 3, 3]
+        for r in range(4):
+            a0 = trs[i, r, 0]; a1 = trs[i, r, 1]; a2 = trs[i, r, 2]; a3 = trs[i, r, 3]
+            l2w[i, r, 0] = a0 * b00 + a1 * b10 + a2 * b20 + a3 * b30
+            l2w[i, r, 1] = a0 * b01 + a1 * b11 + a2 * b21 + a3 * b31
+            l2w[i, r, 2] = a0 * b02 + a1 * b12 + a2 * b22 + a3 * b32
+            l2w[i, r, 3] = a0 * b03 + a1 * b13 + a2 * b23 + a3 * b33
@@ -20,6 +20,7 @@ from __future__         import annotations
 from abc                import ABC, abstractmethod
 from typing             import List
 from collections.abc    import Iterable, Iterator
+import logging
 import os  
 import sys
 
@@ -32,6 +33,8 @@ import uuid
 import pyglGA.ECSS.utilities as util
 from pyglGA.ext.VertexArray import VertexArray
 
+log = logging.getLogger(__name__)
+
 class Shader(Component):
     """
     A concrete OpenGL-GLSL Shader container Component class
@@ -76,8 +79,6 @@ class Shader(Component):
     def __init__(self, name=None, type=None, id=None, vertex_source=None, fragment_source=None):
         super().__init__(name, type, id)
         
-        self._parent = self
-        
         self._glid = None
         self._mat4fDict = {}
         self._mat3fDict = {}
@@ -202,7 +203,8 @@ class Shader(Component):
         
     
     def update(self):
-        print(self.getClassName(), ": update() called")
+        if __debug__:
+            log.debug("%s: update() called", self.getClassName())
         
    
     def accept(self, system: System):
@@ -403,4 +405,5 @@ class RenderGLShaderSystem(System):
         vertexArray.update()
         compShader.disableShader()
         
-        print(f'\nMain shader GL render within {self.getClassName()}::render() \n')
\ No newline at end of file
+        if __debug__:
+            log.debug("Main shader GL render within %s::render()", self.getClassName())
\ No newline at end of file
@@ -42,9 +42,6 @@ class VertexArray(Component):
     def __init__(self, name=None, type=None, id=None, attributes=None, index=None, primitive = gl.GL_TRIANGLES, usage=gl.GL_STATIC_DRAW):
         super().__init__(name, type, id)
         
-        
-        self._parent = self
-        
         self._glid = None
         self._buffers = [] #store all GL buffers
         self._draw_command = None
@@ -45,6 +45,7 @@ class TestScene(unittest.TestCase):
         self.s1 = Scene()
         self.scene = Scene()    
         self.assertEqual(self.s1, self.scene)
+        self.scene.world.reset() # start each test from an empty ECSS
         
         # Scenegraph with Entities, Components
         self.rootEntity = self.scene.world.createEntity(Entity(name="RooT"))
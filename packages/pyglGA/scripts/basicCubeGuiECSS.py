@@ -291,6 +291,9 @@ def main(imguiFlag = False):
     # Add RenderWindow to the EventManager publishers
     eManager._publishers[updateBackground.name] = gGUI
     
+    # the scenegraph is built, keep the garbage collector from scanning it every frame
+    scene.world.freeze()
+    
     while running:
         # ---------------------------------------------------------
         # run Systems in the scenegraph